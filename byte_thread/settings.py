@@ -68,6 +68,7 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.db.StickyPrimaryMiddleware",
 ]
 
 ROOT_URLCONF = "byte_thread.urls"
@@ -87,6 +88,10 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.TokenAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.UserRateThrottle",
         "rest_framework.throttling.AnonRateThrottle",
@@ -119,12 +124,116 @@ WSGI_APPLICATION = "byte_thread.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+DATABASE_PATH = BASE_DIR / "db.sqlite3"
+
+# SQLITE_PRODUCTION=1 switches the database file to WAL, so readers no longer
+# block on (or block) the writer, and tunes the connection for a server:
+# relaxed fsync (safe under WAL), a memory-mapped file, a bigger page cache,
+# waiting on locks instead of failing, and connections kept across requests.
+SQLITE_PRODUCTION = os.getenv("SQLITE_PRODUCTION") == "1"
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA busy_timeout=5000;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA cache_size=-64000;"
+    "PRAGMA temp_store=MEMORY;"
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "NAME": DATABASE_PATH,
+    },
 }
+# Under WAL, a second, read-only connection to the same file for list and feed
+# endpoints (see core.db), so their reads never queue behind a write
+# transaction on the default connection.
+if SQLITE_PRODUCTION:
+    DATABASES["read"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{DATABASE_PATH}?mode=ro",
+        "TEST": {"MIRROR": "default"},
+    }
+# Read replicas: comma-separated paths of copies of the database file kept in
+# sync by an external tool (e.g. Litestream or LiteFS). When set, read-only
+# endpoints are spread over these instead of the default or "read" connection.
+SQLITE_REPLICAS = [path for path in os.getenv("SQLITE_REPLICAS", "").split(",") if path]
+for index, path in enumerate(SQLITE_REPLICAS):
+    DATABASES[f"replica{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{path}?mode=ro",
+        "TEST": {"MIRROR": "default"},
+    }
+# Shards: comma-separated paths of database files that reactions and follows
+# are spread over by owner (see core.shards). Create their tables with
+# `migrate --database shardN` and move existing rows with `reshard`. The users,
+# threads, comments and replies those rows point to stay in default, so shards
+# leave their foreign keys unenforced; deleting one of them deletes the rows
+# pointing to it from every shard instead (see core.signals).
+SQLITE_SHARDS = [path for path in os.getenv("SQLITE_SHARDS", "").split(",") if path]
+for index, path in enumerate(SQLITE_SHARDS):
+    DATABASES[f"shard{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": path,
+        "OPTIONS": {"init_command": "PRAGMA foreign_keys=OFF;"},
+    }
+
+READ_DATABASES = ["read"] if "read" in DATABASES else ["default"]
+if SQLITE_REPLICAS:
+    READ_DATABASES = [f"replica{index}" for index in range(len(SQLITE_REPLICAS))]
+SHARD_DATABASES = [f"shard{index}" for index in range(len(SQLITE_SHARDS))]
+
+if SQLITE_PRODUCTION:
+    for alias, database in DATABASES.items():
+        options = database.setdefault("OPTIONS", {})
+        init_command = options.get("init_command", "")
+        if alias == "read" or alias in READ_DATABASES:
+            options["init_command"] = SQLITE_PRAGMAS + init_command
+        else:
+            options["init_command"] = (
+                "PRAGMA journal_mode=WAL;" + SQLITE_PRAGMAS + init_command
+            )
+            # Take the write lock when the transaction starts rather than
+            # failing with "database is locked" when a reader upgrades to a
+            # writer.
+            options["transaction_mode"] = "IMMEDIATE"
+        database["CONN_MAX_AGE"] = 600
+        database["CONN_HEALTH_CHECKS"] = True
+
+# Feed page versions, user cards, the follow graph's change log and the
+# sticky-to-primary flag live in the default cache, so every worker process
+# must share it: set REDIS_URL when running more than one.
+# Without it each process gets its own local-memory cache, which is all a
+# single development server (or the test suite) needs.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+DATABASE_ROUTERS = ["core.shards.ShardRouter", "core.db.ReadRouter"]
+# Reads of a user who wrote within this many seconds go to the primary.
+REPLICA_STICKY_SECONDS = 5
+
+# Plans `audit_query_plans` accepts: the user directory lists every user, the
+# thread view's reply window is re-sorted by Django's prefetch wrapper, and the
+# comment-sorted feed only orders the threads in the reader's timeline.
+QUERY_PLAN_AUDIT_ALLOW = [
+    "user-list:users_user",
+    "thread-thread-view:threads_reply",
+    "feeds-list:threads_thread",
+]
+
+# Per-action query budgets of the viewsets (see core.queries): "raise" fails
+# requests over budget, "log" checks a sample of requests and logs offenders.
+# `check_query_budgets` runs every read action against growing data.
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log")
+QUERY_BUDGET_SAMPLE_RATE = float(os.getenv("QUERY_BUDGET_SAMPLE_RATE", "0.01"))
 
 
 # Password validation
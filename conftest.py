@@ -0,0 +1,36 @@
+import os
+
+import django
+import pytest
+
+
+def pytest_configure():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "byte_thread.settings")
+    django.setup()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_environment():
+    """Test databases and a local-memory cache for the whole run.
+
+    The cache is local even when REDIS_URL is set, so tests never clear a
+    shared Redis.
+    """
+    from django.test.utils import (
+        override_settings,
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    caches = override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    caches.enable()
+    databases = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(databases, verbosity=0)
+    caches.disable()
+    teardown_test_environment()
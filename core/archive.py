@@ -0,0 +1,40 @@
+from .models import ArchivedRecord
+
+ARCHIVE_CHUNK_SIZE = 500
+
+
+def archive(queryset):
+    """Move the rows of ``queryset`` into ``ArchivedRecord``, many-to-many
+    links as lists of ids. Archive children before parents, in a transaction.
+    """
+    pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(pks), ARCHIVE_CHUNK_SIZE):
+        _archive_chunk(
+            queryset.model, queryset.db, pks[start : start + ARCHIVE_CHUNK_SIZE]
+        )
+    return len(pks)
+
+
+def _archive_chunk(model, using, pks):
+    rows = {
+        row["id"]: row
+        for row in model._base_manager.using(using).filter(pk__in=pks).values()
+    }
+    for field in model._meta.many_to_many:
+        for row in rows.values():
+            row[field.name] = []
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        links = (
+            field.remote_field.through.objects.using(using)
+            .filter(**{f"{source}__in": rows})
+            .order_by("pk")
+            .values_list(source, target)
+        )
+        for pk, related_pk in links:
+            rows[pk][field.name].append(related_pk)
+    ArchivedRecord.objects.bulk_create(
+        ArchivedRecord(model=model._meta.label_lower, object_id=pk, data=row)
+        for pk, row in rows.items()
+    )
+    model._base_manager.using(using).filter(pk__in=rows).delete()
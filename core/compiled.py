@@ -0,0 +1,172 @@
+from operator import attrgetter, itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields as drf_fields
+from rest_framework import relations
+from rest_framework import serializers as drf_serializers
+
+# DRF fields whose to_representation() returns database values unchanged.
+IDENTITY_FIELDS = (
+    drf_fields.BooleanField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.FloatField,
+    drf_fields.IntegerField,
+    drf_fields.JSONField,
+)
+
+
+class Nested:
+    def __init__(self, serializer, many=False, empty=...):
+        self.serializer = serializer
+        self.many = many
+        # For many=True: what to emit instead of an empty list.
+        self.empty = [] if empty is ... else empty
+
+
+class CompiledSerializer:
+    """Read-only, compiled stand-in for the DRF ``serializer_class``.
+
+    Fields are resolved to getters once per input shape (instances or
+    ``.values()`` rows); nested serializers are declared in ``nested``.
+    """
+
+    serializer_class = None
+    nested = {}
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        if self.many:
+            return self.serialize_many(self.instance)
+        return self.serialize(self.instance)
+
+    @classmethod
+    def prepare_rows(cls, rows):
+        """Hook to attach data a flat ``.values()`` row cannot carry (M2M lists)."""
+
+    @classmethod
+    def serialize(cls, obj):
+        return cls.serialize_many([obj])[0]
+
+    @classmethod
+    def serialize_many(cls, objs):
+        objs = list(objs)
+        if objs and isinstance(objs[0], dict):
+            cls.prepare_rows(objs)
+            function = cls.row_function()
+        else:
+            function = cls.instance_function()
+        # Fields with a prefetch(values) method (e.g. cached embeds) get every
+        # value of the page at once before the rows are rendered one by one.
+        for prefetch, getter in function.prefetchers:
+            prefetch({getter(obj) for obj in objs} - {None})
+        return [function(obj) for obj in objs]
+
+    @classmethod
+    def instance_function(cls):
+        if "_instance_function" not in cls.__dict__:
+            cls._instance_function = cls._compile(rows=False)
+        return cls._instance_function
+
+    @classmethod
+    def row_function(cls, prefix=""):
+        functions = cls.__dict__.get("_row_functions")
+        if functions is None:
+            functions = cls._row_functions = {}
+        if prefix not in functions:
+            functions[prefix] = cls._compile(rows=True, prefix=prefix)
+        return functions[prefix]
+
+    @classmethod
+    def _compile(cls, rows, prefix=""):
+        serializer = cls.serializer_class()
+        prefetchers = []
+        getters = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            name = field.field_name
+            source = field.source
+            if "." in source or source == "*":
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}: source {source!r} of {name!r} is not supported"
+                )
+            key = f"{prefix}{source}"
+            if name in cls.nested:
+                getter = cls._nested_getter(name, source, key, rows)
+            else:
+                getter = cls._field_getter(field, name, source, key, rows)
+                if hasattr(field, "prefetch"):
+                    value = itemgetter(key) if rows else attrgetter(source)
+                    prefetchers.append((field.prefetch, value))
+            getters.append((name, getter))
+
+        def to_representation(obj):
+            return {name: getter(obj) for name, getter in getters}
+
+        to_representation.prefetchers = prefetchers
+        return to_representation
+
+    @classmethod
+    def _nested_getter(cls, name, source, key, rows):
+        nested = cls.nested[name]
+        empty = nested.empty
+        if rows and nested.many:
+            render = nested.serializer.row_function()
+            items = itemgetter(key)
+            return lambda obj: [render(item) for item in items(obj)] or empty
+        if rows:
+            nested_prefix = f"{key}__"
+            render = nested.serializer.row_function(nested_prefix)
+            pk = itemgetter(f"{nested_prefix}id")
+            return lambda obj: render(obj) if pk(obj) is not None else None
+        render = nested.serializer.instance_function()
+        related = attrgetter(source)
+        if nested.many:
+            return lambda obj: [render(item) for item in related(obj).all()] or empty
+        return _unless_none(related, render)
+
+    @classmethod
+    def _field_getter(cls, field, name, source, key, rows):
+        if isinstance(field, relations.ManyRelatedField):
+            raise ImproperlyConfigured(
+                f"{cls.__name__}: many-related field {name!r} must be declared nested"
+            )
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            return itemgetter(key) if rows else attrgetter(f"{source}_id")
+        if isinstance(field, drf_serializers.BaseSerializer):
+            raise ImproperlyConfigured(
+                f"{cls.__name__}: nested serializer {name!r} must be declared nested"
+            )
+        if isinstance(field, drf_fields.SerializerMethodField):
+            raise ImproperlyConfigured(
+                f"{cls.__name__}: method field {name!r} cannot be compiled"
+            )
+
+        value = itemgetter(key) if rows else attrgetter(source)
+        if isinstance(field, drf_fields.FileField):
+            if rows:
+                storage = cls.serializer_class.Meta.model._meta.get_field(
+                    source
+                ).storage
+                return _unless_none(
+                    value, lambda path: storage.url(path) if path else None
+                )
+            return _unless_none(value, lambda file: file.url if file else None)
+        if isinstance(field, IDENTITY_FIELDS):
+            return value
+        return _unless_none(value, field.to_representation)
+
+
+def _unless_none(value, convert):
+    """A getter returning ``convert(value(obj))``, or None for a None value."""
+
+    def getter(obj):
+        result = value(obj)
+        return convert(result) if result is not None else None
+
+    return getter
@@ -0,0 +1,107 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+# Connections that read-only endpoints query: replicas of the default
+# database, or a read-only connection to the same file.
+READ_DATABASES = getattr(settings, "READ_DATABASES", ["default"])
+# Replicas trail the primary, so for this many seconds after a user's last
+# write their reads stay on the primary and they always see their own changes.
+# Keep it above the worst replication lag.
+REPLICA_STICKY_SECONDS = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+_read_database = contextvars.ContextVar("read_database", default=None)
+_primary_only = contextvars.ContextVar("primary_only", default=False)
+
+
+def _sticky_key(user_id):
+    return f"db-sticky:{user_id}"
+
+
+def stick_to_primary(user_id):
+    cache.set(_sticky_key(user_id), True, REPLICA_STICKY_SECONDS)
+
+
+@contextmanager
+def primary_only():
+    """Serve every read inside the block from the primary.
+
+    For code that must see its own uncommitted writes through the views, such
+    as checks run inside a transaction that is rolled back.
+    """
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def read_database(user_id=None):
+    """The alias to read from for ``user_id``: a replica, or "default"."""
+    if READ_DATABASES == ["default"] or _primary_only.get():
+        return "default"
+    if user_id is not None and cache.get(_sticky_key(user_id)):
+        return "default"
+    return random.choice(READ_DATABASES)
+
+
+class ReadRouter:
+    def db_for_read(self, model, **hints):
+        return _read_database.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds (a copy of) the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db != "default" and db in READ_DATABASES:
+            return False
+        return None
+
+
+class ReadDatabaseMixin:
+    """Serve the viewset's ``read_actions`` from ``READ_DATABASES``.
+
+    The choice is made once the request is authenticated, so a user who has
+    just written is kept on the primary.
+    """
+
+    read_actions = frozenset({"list", "retrieve"})
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_database.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.read_actions:
+            _read_database.set(read_database(request.user.pk))
+
+
+class StickyPrimaryMiddleware:
+    """Keep a user's reads on the primary for a while after each write."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF hands the user it authenticated back to the Django request.
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and user is not None
+            and user.is_authenticated
+        ):
+            stick_to_primary(user.pk)
+        return response
@@ -0,0 +1,361 @@
+import re
+from contextlib import ExitStack, contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import shards
+from core.db import primary_only
+from core.models import Image
+from core.queries import QueryBudgetExceeded
+from threads.models import (
+    Comment,
+    CommentReactions,
+    Reply,
+    ReplyReactions,
+    Thread,
+    ThreadReactions,
+)
+from users.graph import graph
+from users.models import Followers, User
+
+# Full scans and sorts that are accepted, as table names ("users_user") or
+# "<url name>:<table>" pairs ("user-list:users_user").
+QUERY_PLAN_AUDIT_ALLOW = getattr(settings, "QUERY_PLAN_AUDIT_ALLOW", [])
+
+# Query strings audited on top of the plain request, per URL name, for
+# actions whose queries depend on their parameters.
+VARIANTS = {
+    "feeds-list": [{"sort": "comments"}, {"sort": "reactions"}, {"sort": "old"}],
+    "thread-reactions": [{"reaction": "like"}, {"following_first": "1"}],
+    "comment-reactions": [{"reaction": "like"}, {"following_first": "1"}],
+    "reply-reactions": [{"reaction": "like"}, {"following_first": "1"}],
+    "explore-list": [{"reactions": "1"}],
+}
+
+# Requests run against a private cache, so cached pages do not hide queries
+# and the audit leaves the real cache alone.
+AUDIT_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "audit-query-plans",
+    }
+}
+
+SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+SQLITE_TABLE = re.compile(r"^(?:SCAN|SEARCH) (\w+)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_TABLE = re.compile(r"(?:Scan|Scan using \w+) on (\w+)")
+POSTGRES_SORT = re.compile(r"^\s*(?:->\s*)?Sort\b")
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every GET route of the registered routers with synthetic data "
+        "(rolled back afterwards), EXPLAIN the queries they run and report "
+        "full table scans and temporary sorts, with suggested indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit with an error when a problem is found (for CI)",
+        )
+        parser.add_argument(
+            "--allow",
+            action="append",
+            default=[],
+            help="Table or <url name>:<table> to accept (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        self.aliases = list(dict.fromkeys(["default", *shards.SHARD_DATABASES]))
+        self.tables = {model._meta.db_table: model for model in apps.get_models()}
+        with self.sandbox():
+            findings = self.audit()
+
+        allowed = set(QUERY_PLAN_AUDIT_ALLOW) | set(options["allow"])
+        problems = [
+            finding
+            for finding in findings
+            if finding["table"] not in allowed
+            and f"{finding['route']}:{finding['table']}" not in allowed
+        ]
+        self.report(problems, options["verbosity"])
+        if options["check"] and problems:
+            raise CommandError(f"{len(problems)} query plan problem(s)")
+
+    @contextmanager
+    def sandbox(self):
+        """Seed data for the requests inside, rolled back on exit."""
+        with override_settings(CACHES=AUDIT_CACHES), primary_only():
+            try:
+                with ExitStack() as stack:
+                    for alias in self.aliases:
+                        stack.enter_context(transaction.atomic(using=alias))
+                    self.seed()
+                    yield
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def seed(self):
+        self.user = User.objects.create(username="audit-viewer")
+        author = User.objects.create(username="audit-author")
+        self.follow = Followers.objects.create(follower=self.user, following=author)
+        self.image = Image.objects.create(
+            image="images/audit.png", created_by=self.user
+        )
+        self.thread = Thread.objects.create(user=author, title="Audit", content="c")
+        self.thread.images.add(self.image)
+        self.comment = Comment.objects.create(
+            thread=self.thread, user=author, content="c", comment_type="text"
+        )
+        self.reply = Reply.objects.create(
+            comment=self.comment, user=author, content="r", comment_type="text"
+        )
+        ThreadReactions.objects.create(
+            thread=self.thread, user=self.user, reaction="like"
+        )
+        CommentReactions.objects.create(
+            comment=self.comment, user=self.user, reaction="like"
+        )
+        ReplyReactions.objects.create(reply=self.reply, user=self.user, reaction="like")
+        self.objects = {
+            Thread: self.thread,
+            Comment: self.comment,
+            Reply: self.reply,
+            User: author,
+            Followers: self.follow,
+            Image: self.image,
+        }
+        self.url_kwargs = {
+            "threads_pk": self.thread.pk,
+            "comments_pk": self.comment.pk,
+        }
+        # Parameters every request gets (e.g. the ids the reaction summary reads).
+        self.params = {
+            "thread": self.thread.pk,
+            "comment": self.comment.pk,
+            "reply": self.reply.pk,
+        }
+        # The follow graph reads every follow once per process, not per request.
+        graph.following_ids(self.user)
+
+    def routes(self, patterns, prefix=""):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from self.routes(
+                    pattern.url_patterns, prefix + str(pattern.pattern)
+                )
+            elif getattr(pattern.callback, "actions", None):
+                yield prefix + str(pattern.pattern), pattern
+
+    def kwargs_for(self, pattern):
+        kwargs = {}
+        for name in pattern.pattern.regex.groupindex:
+            if name == "pk":
+                queryset = getattr(pattern.callback.cls, "queryset", None)
+                obj = self.objects.get(getattr(queryset, "model", None))
+                value = None if obj is None else obj.pk
+            else:
+                # Format suffixes and unknown kwargs are not audited.
+                value = self.url_kwargs.get(name)
+            if value is None:
+                return None
+            kwargs[name] = value
+        return kwargs
+
+    def requests(self):
+        """``(pattern, action, params, request, kwargs)`` for each GET action."""
+        factory = APIRequestFactory()
+        for route, pattern in self.routes(get_resolver().url_patterns):
+            action = pattern.callback.actions.get("get")
+            kwargs = self.kwargs_for(pattern)
+            if action is None or kwargs is None:
+                continue
+            for params in [{}, *VARIANTS.get(pattern.name, [])]:
+                request = factory.get(f"/{route}", {**self.params, **params})
+                force_authenticate(request, user=self.user)
+                yield pattern, action, params, request, kwargs
+
+    def audit(self):
+        findings = []
+        self.requests_run = self.queries = 0
+        for pattern, action, params, request, kwargs in self.requests():
+            with ExitStack() as stack:
+                captures = {
+                    alias: stack.enter_context(
+                        CaptureQueriesContext(connections[alias])
+                    )
+                    for alias in self.aliases
+                }
+                error = self.request(pattern.callback, request, kwargs)
+            self.requests_run += 1
+            if error is not None:
+                # A route that cannot be requested cannot be audited.
+                findings.append(
+                    {
+                        "route": pattern.name,
+                        "action": action,
+                        "params": params,
+                        "kind": "error",
+                        "table": None,
+                        "detail": error,
+                        "sql": None,
+                    }
+                )
+                continue
+            for alias, capture in captures.items():
+                for query in capture.captured_queries:
+                    sql = query["sql"]
+                    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                        continue
+                    self.queries += 1
+                    for kind, table, detail in self.problems(alias, sql):
+                        findings.append(
+                            {
+                                "route": pattern.name,
+                                "action": action,
+                                "params": params,
+                                "kind": kind,
+                                "table": table,
+                                "detail": detail,
+                                "sql": sql,
+                            }
+                        )
+        return findings
+
+    def request(self, view, request, kwargs):
+        """Run one request; returns why it failed, or None.
+
+        Only database errors and exceeded query budgets are reported as
+        failures; any other exception is a bug and aborts the command.
+        """
+        try:
+            # A savepoint per request keeps a failing view from breaking the
+            # transaction the rest of the audit runs in.
+            with ExitStack() as stack:
+                for alias in self.aliases:
+                    stack.enter_context(transaction.atomic(using=alias))
+                response = view(request, **kwargs)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+        except (DatabaseError, QueryBudgetExceeded) as exc:
+            return f"{type(exc).__name__}: {exc}"
+        if response.status_code >= 400:
+            return f"HTTP {response.status_code}"
+        return None
+
+    def explain(self, alias, sql):
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                return [row[3] for row in cursor.fetchall()]
+            cursor.execute(f"EXPLAIN {sql}")
+            return [row[0] for row in cursor.fetchall()]
+
+    def problems(self, alias, sql):
+        """``(kind, table, plan line)`` for every scan and sort in the plan."""
+        sqlite = connections[alias].vendor == "sqlite"
+        table_pattern = SQLITE_TABLE if sqlite else POSTGRES_TABLE
+        main_table = None
+        for detail in self.explain(alias, sql):
+            match = table_pattern.search(detail)
+            if match and match.group(1) in self.tables and main_table is None:
+                main_table = match.group(1)
+            scan = (SQLITE_SCAN.match if sqlite else POSTGRES_SCAN.search)(detail)
+            if scan and scan.group(1) in self.tables:
+                yield "scan", scan.group(1), detail.strip()
+            elif (
+                detail.startswith("USE TEMP B-TREE")
+                if sqlite
+                else POSTGRES_SORT.match(detail)
+            ):
+                yield "sort", main_table, detail.strip()
+
+    def suggest(self, table, sql):
+        """An index on the table's filtered columns, then its ordering."""
+        model = self.tables.get(table)
+        if model is None:
+            return None
+        column = re.escape(f'"{table}".') + r'"(\w+)"'
+        where, _, order = sql.rpartition(" ORDER BY ")
+        if not where:
+            where, order = sql, ""
+        where = where.partition(" WHERE ")[2]
+        names = {field.column: field.name for field in model._meta.concrete_fields}
+        pk = model._meta.pk.column
+        # ORDER BY may name a select column by position or by alias.
+        selected = re.findall(column, sql.partition(" FROM ")[0])
+        aliases = {
+            alias: name for name, alias in re.findall(column + r' AS "(\w+)"', sql)
+        }
+        fields = []
+        live = f'NOT "{table}"."is_deleted"' in where
+        for name in re.findall(column + r" (?:= |IN \(|IS NULL)", where):
+            if name == "is_deleted":
+                live = True
+            elif name != pk and names.get(name) and names[name] not in fields:
+                fields.append(names[name])
+        for term in order.partition(" LIMIT ")[0].split(", "):
+            match = re.match(r'(?:"\w+"\.)?"?(\w+)"? (ASC|DESC)$', term.strip())
+            if match is None:
+                continue
+            name, direction = match.groups()
+            if name.isdigit():
+                index = int(name) - 1
+                name = selected[index] if index < len(selected) else None
+            field = names.get(aliases.get(name, name))
+            if field and field not in fields and f"-{field}" not in fields:
+                fields.append(f"-{field}" if direction == "DESC" else field)
+        if not fields:
+            return None
+        for index in model._meta.indexes:
+            if list(index.fields[: len(fields)]) == fields:
+                return f"{model._meta.label}: covered by {index.name}"
+        condition = ", condition=models.Q(is_deleted=False)" if live else ""
+        return (
+            f"{model._meta.label}: models.Index(fields={fields!r}{condition})".replace(
+                "'", '"'
+            )
+        )
+
+    def report(self, problems, verbosity):
+        seen = {}
+        for finding in problems:
+            key = (
+                finding["route"],
+                finding["kind"],
+                finding["table"],
+                finding["detail"],
+            )
+            seen.setdefault(key, finding)
+        for (route, kind, table, detail), finding in seen.items():
+            params = "&".join(f"{k}={v}" for k, v in finding["params"].items())
+            where = f"{route} [{finding['action']}{'?' + params if params else ''}]"
+            self.stdout.write(
+                self.style.WARNING(f"{kind:<5} {where} {table}: {detail}")
+            )
+            suggestion = self.suggest(table, finding["sql"]) if table else None
+            if suggestion:
+                self.stdout.write(f"      suggested index: {suggestion}")
+            if verbosity > 1:
+                self.stdout.write(f"      {finding['sql']}")
+        summary = (
+            f"Audited {self.queries} queries from {self.requests_run} requests: "
+            f"{len(seen)} problem(s)"
+        )
+        style = self.style.WARNING if seen else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,140 @@
+import json
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import shards
+from core.models import Image
+from feeds.serializers import CompiledFeedThreadSerializer, FeedThreadSerializer
+from threads.models import Thread, ThreadReactions
+from threads.serializers import (
+    CompiledThreadReactionsSerializer,
+    ThreadReactionsSerializer,
+)
+from users.cards import cards
+from users.models import User
+from users.serializers import CompiledUserListSerializer, UserListSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the DRF serializers of the hot list endpoints against their "
+        "compiled versions on synthetic rows (rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with ExitStack() as stack:
+                # Sharded reactions are written outside the default database.
+                for alias in ["default", *shards.SHARD_DATABASES]:
+                    stack.enter_context(transaction.atomic(using=alias))
+                self.seed(options["rows"])
+                self.run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+        cards.invalidate(self.user_ids)
+
+    def seed(self, rows):
+        users = User.objects.bulk_create(
+            User(username=f"benchmark-{index}", is_verified=index % 2 == 0)
+            for index in range(rows)
+        )
+        avatars = Image.objects.bulk_create(
+            Image(image=f"images/benchmark-{user.pk}.png", created_by=user)
+            for user in users
+        )
+        for index, user in enumerate(users):
+            # Every third user has no avatar, to cover the null branch.
+            user.avatar = avatars[index] if index % 3 else None
+        User.objects.bulk_update(users, ["avatar"])
+        threads = Thread.objects.bulk_create(
+            Thread(
+                user=user,
+                title=f"Benchmark {index}",
+                content="lorem ipsum " * 20,
+                reactions_count=index,
+                comments_count=index // 2,
+            )
+            for index, user in enumerate(users)
+        )
+        Thread.images.through.objects.bulk_create(
+            Thread.images.through(thread_id=thread.pk, image_id=avatars[index].pk)
+            for index, thread in enumerate(threads)
+            if index % 2
+        )
+        ThreadReactions.objects.bulk_create(
+            ThreadReactions(thread=threads[0], user=user, reaction="like")
+            for user in users
+        )
+        self.thread_ids = [thread.pk for thread in threads]
+        self.user_ids = [user.pk for user in users]
+
+    def run(self, repeat):
+        threads = Thread.objects.filter(id__in=self.thread_ids).order_by("id")
+        users = User.objects.filter(id__in=self.user_ids).order_by("id")
+        reactions = ThreadReactions.objects.filter(
+            thread_id=self.thread_ids[0]
+        ).order_by("id")
+        cases = [
+            (
+                "feed",
+                lambda: (
+                    FeedThreadSerializer(
+                        threads.prefetch_related("images"), many=True
+                    ).data
+                ),
+                lambda: (
+                    CompiledFeedThreadSerializer(
+                        CompiledFeedThreadSerializer.values(threads), many=True
+                    ).data
+                ),
+            ),
+            (
+                "users",
+                lambda: (
+                    UserListSerializer(users.select_related("avatar"), many=True).data
+                ),
+                lambda: (
+                    CompiledUserListSerializer(
+                        users.select_related("avatar"), many=True
+                    ).data
+                ),
+            ),
+            (
+                "reactions",
+                lambda: ThreadReactionsSerializer(reactions, many=True).data,
+                lambda: CompiledThreadReactionsSerializer(reactions, many=True).data,
+            ),
+        ]
+        for name, drf, compiled in cases:
+            expected = json.dumps(drf())
+            if json.dumps(compiled()) != expected:
+                raise CommandError(f"{name}: compiled output differs from DRF")
+            drf_seconds = self.time(drf, repeat)
+            compiled_seconds = self.time(compiled, repeat)
+            self.stdout.write(
+                f"{name:<10} drf {drf_seconds * 1000:8.1f}ms  "
+                f"compiled {compiled_seconds * 1000:8.1f}ms  "
+                f"x{drf_seconds / compiled_seconds:.1f}"
+            )
+
+    @staticmethod
+    def time(function, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
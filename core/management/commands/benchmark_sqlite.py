@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = """
+CREATE TABLE thread (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    reactions_count INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE TABLE reaction (
+    id INTEGER PRIMARY KEY,
+    thread_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    UNIQUE (thread_id, user_id)
+);
+CREATE INDEX thread_created_at ON thread (created_at);
+"""
+
+# A feed page: the newest threads with their counters.
+READ = "SELECT id, title, reactions_count FROM thread ORDER BY created_at DESC LIMIT 20"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent read/write throughput of a scratch SQLite file with "
+        "the default connection settings and with SQLITE_PRODUCTION ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--rows", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        modes = [
+            ("default", None, "DEFERRED"),
+            (
+                "production",
+                "PRAGMA journal_mode=WAL;" + settings.SQLITE_PRAGMAS,
+                "IMMEDIATE",
+            ),
+        ]
+        for name, pragmas, begin in modes:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                self.seed(path, pragmas, options["rows"])
+                reads, writes, errors = self.run(path, pragmas, begin, options)
+            seconds = options["seconds"]
+            self.stdout.write(
+                f"{name:<10} reads {reads / seconds:9.0f}/s  "
+                f"writes {writes / seconds:7.0f}/s  locked {errors}"
+            )
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+        if pragmas:
+            connection.executescript(pragmas)
+        return connection
+
+    def seed(self, path, pragmas, rows):
+        connection = self.connect(path, pragmas)
+        connection.executescript(SCHEMA)
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO thread (title, content, created_at) VALUES (?, ?, ?)",
+            ((f"Thread {index}", "lorem ipsum " * 20, index) for index in range(rows)),
+        )
+        connection.execute("COMMIT")
+        connection.close()
+
+    def run(self, path, pragmas, begin, options):
+        deadline = time.monotonic() + options["seconds"]
+        rows = options["rows"]
+        totals = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def reader():
+            connection = self.connect(path, pragmas)
+            reads = 0
+            while time.monotonic() < deadline:
+                connection.execute(READ).fetchall()
+                reads += 1
+            connection.close()
+            with lock:
+                totals["reads"] += reads
+
+        def writer(offset):
+            connection = self.connect(path, pragmas)
+            writes = errors = 0
+            user_id = offset
+            while time.monotonic() < deadline:
+                thread_id = user_id % rows + 1
+                try:
+                    # Like a buffered reaction flush: the row and its counter.
+                    connection.execute(f"BEGIN {begin}")
+                    connection.execute(
+                        "INSERT OR IGNORE INTO reaction (thread_id, user_id) "
+                        "VALUES (?, ?)",
+                        (thread_id, user_id),
+                    )
+                    connection.execute(
+                        "UPDATE thread SET reactions_count = reactions_count + 1 "
+                        "WHERE id = ?",
+                        (thread_id,),
+                    )
+                    connection.execute("COMMIT")
+                    writes += 1
+                except sqlite3.OperationalError:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    errors += 1
+                user_id += options["writers"]
+            connection.close()
+            with lock:
+                totals["writes"] += writes
+                totals["errors"] += errors
+
+        workers = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        workers += [
+            threading.Thread(target=writer, args=(offset,))
+            for offset in range(options["writers"])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return totals["reads"], totals["writes"], totals["errors"]
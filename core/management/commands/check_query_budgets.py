@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.core.management.base import CommandError
+
+from core import shards
+from core.queries import QueryRecorder, enforce_query_budgets, query_budget
+from threads.models import (
+    Comment,
+    CommentReactions,
+    Reply,
+    ReplyReactions,
+    Thread,
+    ThreadReactions,
+)
+from users.models import Followers, Suggestion, User
+
+from .audit_query_plans import Command as AuditCommand
+
+
+class Command(AuditCommand):
+    help = (
+        "Request every GET route of the registered routers with a little and "
+        "with more synthetic data (rolled back afterwards) and fail on actions "
+        "over their query budget or running a query per row"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=20,
+            help="Rows added under each seeded object for the second pass",
+        )
+
+    def handle(self, *args, **options):
+        self.aliases = list(dict.fromkeys(["default", *shards.SHARD_DATABASES]))
+        with self.sandbox(), enforce_query_budgets():
+            small = self.measure()
+            self.grow(options["rows"])
+            large = self.measure()
+
+        failures = 0
+        for key, (count, error) in large.items():
+            route, action, params = key
+            view = self.views[key]
+            where = f"{route} [{action}{'?' + params if params else ''}]"
+            line = (
+                f"{where:<48} budget {query_budget(view, action):>3}  "
+                f"queries {small[key][0]:>3} -> {count:>3}"
+            )
+            if error is None:
+                if options["verbosity"] > 1:
+                    self.stdout.write(line)
+                continue
+            failures += 1
+            self.stdout.write(self.style.WARNING(line))
+            self.stdout.write(f"      {error}")
+        if failures:
+            raise CommandError(f"{failures} request(s) failed or went over budget")
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(large)} requests within their query budgets")
+        )
+
+    def measure(self):
+        """``{(route, action, params): (queries, error)}`` for every request."""
+        # Pages cached by the previous pass would hide this one's queries.
+        cache.clear()
+        results = {}
+        self.views = {}
+        for pattern, action, params, request, kwargs in self.requests():
+            key = (
+                pattern.name,
+                action,
+                "&".join(f"{k}={v}" for k, v in params.items()),
+            )
+            with QueryRecorder() as recorder:
+                error = self.request(pattern.callback, request, kwargs)
+            results[key] = (recorder.count(), error)
+            self.views[key] = pattern.callback.cls
+        return results
+
+    def grow(self, rows):
+        """Add ``rows`` of everything the seeded objects list or count."""
+        for index in range(rows):
+            other = User.objects.create(username=f"audit-user-{index}")
+            Followers.objects.create(follower=self.user, following=other)
+            Followers.objects.create(follower=other, following=self.user)
+            Suggestion.objects.create(user=self.user, suggested=other, score=index)
+            thread = Thread.objects.create(user=other, title="Audit", content="c")
+            thread.images.add(self.image)
+            comment = Comment.objects.create(
+                thread=self.thread, user=other, content="c", comment_type="text"
+            )
+            reply = Reply.objects.create(
+                comment=self.comment, user=other, content="r", comment_type="text"
+            )
+            ThreadReactions.objects.create(
+                thread=self.thread, user=other, reaction="like"
+            )
+            ThreadReactions.objects.create(thread=thread, user=other, reaction="like")
+            CommentReactions.objects.create(
+                comment=self.comment, user=other, reaction="like"
+            )
+            CommentReactions.objects.create(
+                comment=comment, user=other, reaction="like"
+            )
+            ReplyReactions.objects.create(reply=self.reply, user=other, reaction="like")
+            ReplyReactions.objects.create(reply=reply, user=other, reaction="like")
@@ -0,0 +1,119 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from core import shards
+
+
+class Command(BaseCommand):
+    help = (
+        "Move rows of the sharded tables (reactions, follows) to the shard "
+        "their owner maps to under the current SHARD_DATABASES. Moved rows "
+        "get a new id in their shard, so e.g. follow ids change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            default=None,
+            help=(
+                "Database alias to move rows out of (repeatable). Defaults to "
+                "default and every shard; when shrinking, add the retired "
+                "shards (still configured in DATABASES)."
+            ),
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        sources = options["source"] or ["default", *shards.SHARD_DATABASES]
+        for alias in sources:
+            if alias not in connections:
+                raise CommandError(f"Unknown database alias {alias!r}")
+        for model in shards.sharded_models():
+            moved = 0
+            for source in dict.fromkeys(sources):
+                moved += self.move(model, source, options)
+            verb = "Would move" if options["dry_run"] else "Moved"
+            self.stdout.write(
+                self.style.SUCCESS(f"{verb} {moved} {model._meta.label} rows")
+            )
+
+    def move(self, model, source, options):
+        attname = model._meta.get_field(model.shard_key).attname
+        rows = model.objects.using(source).order_by("pk")
+        last_pk = 0
+        moved = 0
+        while True:
+            chunk = list(rows.filter(pk__gt=last_pk)[: options["chunk_size"]])
+            if not chunk:
+                return moved
+            last_pk = chunk[-1].pk
+            targets = {}
+            for obj in chunk:
+                target = shards.shard_for(getattr(obj, attname))
+                if target != source:
+                    targets.setdefault(target, []).append(obj)
+            for target, objs in targets.items():
+                moved += len(objs)
+                if not options["dry_run"]:
+                    self.copy(model, source, target, objs)
+
+    def copy(self, model, source, target, objs):
+        pks = [obj.pk for obj in objs]
+        objs = self.missing(model, target, objs)
+        stamps = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+            or getattr(field, "auto_now_add", False)
+        ]
+        saved = [[getattr(obj, attname) for attname in stamps] for obj in objs]
+        for obj in objs:
+            # Ids are per database; the row gets a new one in its shard.
+            obj.pk = None
+            obj._state.adding = True
+        # Two databases cannot share a transaction: the copy commits first,
+        # then the originals are deleted. Until then the rows exist on both,
+        # so readers fanning out over every shard may see them twice; a run
+        # interrupted in between leaves the duplicates, which the next run
+        # deletes from the source without copying them again.
+        with transaction.atomic(using=target):
+            model.objects.using(target).bulk_create(objs)
+            if stamps:
+                # bulk_create stamps the rows with the current time.
+                for obj, values in zip(objs, saved):
+                    for attname, value in zip(stamps, values):
+                        setattr(obj, attname, value)
+                model.objects.using(target).bulk_update(objs, stamps)
+        with transaction.atomic(using=source), shards.moving():
+            model.objects.using(source).filter(pk__in=pks).delete()
+
+    def missing(self, model, target, objs):
+        """The objects not yet copied to ``target`` by an earlier run.
+
+        Copies have new ids, so rows are matched on their unique fields, or
+        on all their columns (e.g. follower, following and timestamps).
+        """
+        if model._meta.unique_together:
+            fields = [
+                model._meta.get_field(name).attname
+                for name in model._meta.unique_together[0]
+            ]
+        else:
+            fields = [
+                field.attname
+                for field in model._meta.concrete_fields
+                if not field.primary_key
+            ]
+        attname = model._meta.get_field(model.shard_key).attname
+        existing = set(
+            model.objects.using(target)
+            .filter(**{f"{attname}__in": {getattr(obj, attname) for obj in objs}})
+            .values_list(*fields)
+        )
+        return [
+            obj
+            for obj in objs
+            if tuple(getattr(obj, field) for field in fields) not in existing
+        ]
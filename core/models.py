@@ -1,4 +1,6 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 
 # Abstract models
@@ -17,6 +19,9 @@ class SoftDeleteManager(models.Manager):
 
 class SoftDelete(models.Model):
     is_deleted = models.BooleanField(default=False)
+    # Rows deleted together (a thread and its comments) share one timestamp,
+    # which is how a restore knows what to bring back.
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     objects = SoftDeleteManager()
     all_objects = models.Manager()
@@ -26,6 +31,7 @@ class SoftDelete(models.Model):
 
     def delete(self, *args, **kwargs):
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         self.save()
 
 
@@ -37,3 +43,18 @@ class Image(models.Model):
 
     def __str__(self):
         return self.image.name
+
+
+class ArchivedRecord(models.Model):
+    """A row moved out of its table by the archival job, kept as JSON."""
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "object_id"])]
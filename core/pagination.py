@@ -0,0 +1,129 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination on the queryset's ``order_by`` (no COUNT, no OFFSET).
+
+    The cursor holds the ordering values of the last row of the page. The
+    primary key is appended as a tie-breaker unless an explicit, already
+    unique ``ordering`` is passed in.
+    """
+
+    page_size = 20
+    cursor_query_param = "cursor"
+    ordering = ("-created_at",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None, ordering=None):
+        if ordering is None:
+            ordering = self.get_ordering(queryset)
+        position = self.begin(request, ordering, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.seek(position))
+        return self.end(list(queryset.order_by(*ordering)[: self.page_size + 1]))
+
+    def begin(self, request, ordering, model):
+        """Start a page and return the decoded cursor position (or ``None``).
+
+        Sources that are not a single queryset fetch up to ``page_size + 1``
+        rows after that position themselves and hand them to ``end()``.
+        """
+        self.request = request
+        self.ordering_fields = [
+            (field.lstrip("-"), field.startswith("-")) for field in ordering
+        ]
+        return self.decode_cursor(request, model)
+
+    def end(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        self.next_position = self.get_position(self.page[-1]) if self.page else None
+        return self.page
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(self.ordering)
+        pk = queryset.model._meta.pk
+        names = {field.lstrip("-") for field in ordering}
+        if names.isdisjoint({"pk", pk.name, pk.attname}):
+            descending = ordering[-1].startswith("-")
+            ordering.append(f"-{pk.attname}" if descending else pk.attname)
+        return ordering
+
+    def seek(self, position):
+        query = Q()
+        for index, (name, descending) in enumerate(self.ordering_fields):
+            lookup = "lt" if descending else "gt"
+            condition = Q(**{f"{name}__{lookup}": position[index]})
+            for prefix_index, (prefix, _) in enumerate(self.ordering_fields[:index]):
+                condition &= Q(**{prefix: position[prefix_index]})
+            query |= condition
+        return query
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return [item[name] for name, _ in self.ordering_fields]
+        return [getattr(item, name) for name, _ in self.ordering_fields]
+
+    def encode_cursor(self, position):
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in position
+        ]
+        return b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            values = json.loads(b64decode(encoded.encode(), validate=True))
+            if len(values) != len(self.ordering_fields):
+                raise ValueError
+            return [
+                self._to_python(model, name, value)
+                for (name, _), value in zip(self.ordering_fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _to_python(self, model, name, value):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            if name == "pk":
+                field = model._meta.pk
+            else:
+                # Annotated values (counts, scores) are stored as plain JSON.
+                return value
+        return field.to_python(value)
+
+    def get_next_link(self, url=None):
+        if not self.has_next:
+            return None
+        if url is None:
+            url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
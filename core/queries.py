@@ -0,0 +1,175 @@
+import contextvars
+import logging
+import random
+import re
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from types import MappingProxyType
+
+from django.conf import settings
+from django.db import connections
+
+from .shards import SHARD_DATABASES
+
+logger = logging.getLogger(__name__)
+
+# What viewsets with ``query_budgets`` do with the SQL of a request: "raise"
+# fails requests over budget (tests, CI), "log" records a sample of requests
+# and logs the ones over budget (production), "off" skips the accounting.
+QUERY_BUDGET_MODE = getattr(settings, "QUERY_BUDGET_MODE", "log")
+# Share of requests recorded in "log" mode.
+QUERY_BUDGET_SAMPLE_RATE = getattr(settings, "QUERY_BUDGET_SAMPLE_RATE", 0.01)
+# Budget of actions a viewset does not declare.
+QUERY_BUDGET_DEFAULT = getattr(settings, "QUERY_BUDGET_DEFAULT", 10)
+# Queries every request runs before the view: the token lookup, which loads
+# its user in the same query.
+AUTH_QUERIES = 1
+# A query shape run this many times on one connection in one request is
+# reported as an N+1 (a query per row) even within budget.
+QUERY_REPEAT_LIMIT = getattr(settings, "QUERY_REPEAT_LIMIT", 5)
+
+_mode = contextvars.ContextVar("query_budget_mode", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\?(?:, \?)+\)")
+# Transaction bookkeeping, not counted against budgets.
+_TRANSACTION = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE SAVEPOINT")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_shape(sql):
+    """``sql`` with its literals and parameter lists blanked out.
+
+    Queries that only differ by the ids they look up share a shape.
+    """
+    shape = _NUMBER.sub("?", _STRING.sub("?", sql)).replace("%s", "?")
+    return _LIST.sub("(...)", " ".join(shape.split()))
+
+
+@contextmanager
+def enforce_query_budgets():
+    """Fail every budgeted request inside the block that goes over budget.
+
+    For tests: ``with enforce_query_budgets(): client.get(url)``.
+    """
+    token = _mode.set("raise")
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+class QueryRecorder:
+    """Records the SQL run on every connection while entered.
+
+    Can be entered again, e.g. around a streamed response body.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __enter__(self):
+        self._wrappers = ExitStack()
+        for alias in connections:
+            self._wrappers.enter_context(
+                connections[alias].execute_wrapper(partial(self._record, alias))
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrappers.close()
+
+    def _record(self, alias, execute, sql, params, many, context):
+        if not sql.startswith(_TRANSACTION):
+            self.queries.append((alias, sql))
+        return execute(sql, params, many, context)
+
+    def repeated(self, limit=QUERY_REPEAT_LIMIT):
+        """``(alias, shape, count)`` of the shapes run ``limit`` times or more."""
+        shapes = Counter((alias, query_shape(sql)) for alias, sql in self.queries)
+        return [
+            (alias, shape, count)
+            for (alias, shape), count in shapes.most_common()
+            if count >= limit
+        ]
+
+    def count(self):
+        """Queries run, counting a query fanned out over the shards once."""
+        count = 0
+        fanned_out = defaultdict(Counter)
+        for alias, sql in self.queries:
+            if alias in SHARD_DATABASES:
+                fanned_out[query_shape(sql)][alias] += 1
+            else:
+                count += 1
+        return count + sum(max(runs.values()) for runs in fanned_out.values())
+
+    def problems(self, budget):
+        problems = []
+        count = self.count()
+        if count > budget:
+            problems.append(f"{count} queries, budget {budget}")
+        for alias, shape, count in self.repeated():
+            problems.append(f"{count}x on {alias}: {shape}")
+        return problems
+
+
+def budgets(**queries):
+    """``query_budgets`` giving each action ``queries`` on top of the token
+    lookup."""
+    return MappingProxyType(
+        {action: AUTH_QUERIES + count for action, count in queries.items()}
+    )
+
+
+def query_budget(view_class, action):
+    return view_class.query_budgets.get(action, QUERY_BUDGET_DEFAULT)
+
+
+class QueryBudgetMixin:
+    """Hold each action to its entry in ``query_budgets`` and catch N+1s.
+
+    Budgets count the queries of a request, streamed body included, and do
+    not grow with the data. Others get ``QUERY_BUDGET_DEFAULT``.
+    """
+
+    query_budgets = MappingProxyType({})
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = _mode.get() or QUERY_BUDGET_MODE
+        if mode == "off" or (
+            mode == "log" and random.random() >= QUERY_BUDGET_SAMPLE_RATE
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        recorder = QueryRecorder()
+        with recorder:
+            response = super().dispatch(request, *args, **kwargs)
+        if not response.streaming:
+            self.check_query_budget(recorder, mode)
+            return response
+
+        def streaming_content(content):
+            with recorder:
+                yield from content
+            self.check_query_budget(recorder, mode)
+
+        response.streaming_content = streaming_content(response.streaming_content)
+        return response
+
+    def check_query_budget(self, recorder, mode):
+        # self.action is unset when the request failed before routing.
+        action = getattr(self, "action", None)
+        problems = recorder.problems(query_budget(type(self), action))
+        if not problems:
+            return
+        where = f"{type(self).__name__}.{action}"
+        if mode == "raise":
+            raise QueryBudgetExceeded(f"{where}: " + "; ".join(problems))
+        for problem in problems:
+            logger.warning("%s over query budget: %s", where, problem)
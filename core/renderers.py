@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAM_CHUNK_SIZE = getattr(settings, "STREAM_CHUNK_SIZE", 500)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed.
+
+    Output is the same compact UTF-8 JSON as the stdlib path; indented
+    (browsable/``indent=``) responses still go through ``JSONRenderer``.
+    """
+
+    def dumps(self, data):
+        if orjson is None:
+            return super().render(data)
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return self.dumps(data)
+
+    def stream(self, chunks):
+        """Encode an iterable of lists as one JSON array, a chunk at a time."""
+        yield b"["
+        separator = b""
+        for chunk in chunks:
+            if chunk:
+                yield separator + b",".join(self.dumps(item) for item in chunk)
+                separator = b","
+        yield b"]"
+
+
+class StreamingListMixin:
+    """Stream an unpaginated list, ``stream_chunk_size`` rows at a time.
+
+    Used by the thread list, the one unpaginated list endpoint. Responses not
+    rendered by ``FastJSONRenderer`` are built in full.
+    """
+
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        return self.stream_list(self.filter_queryset(self.get_queryset()))
+
+    def stream_list(self, queryset, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        context = self.get_serializer_context()
+        renderer = getattr(self.request, "accepted_renderer", None)
+        if not isinstance(renderer, FastJSONRenderer):
+            return Response(serializer_class(queryset, many=True, context=context).data)
+
+        # The rows are read after the view has returned; keep them on the
+        # connection the router picks now.
+        queryset = queryset.using(queryset.db)
+
+        def chunks():
+            chunk = []
+            for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+                chunk.append(obj)
+                if len(chunk) == self.stream_chunk_size:
+                    yield serializer_class(chunk, many=True, context=context).data
+                    chunk = []
+            yield serializer_class(chunk, many=True, context=context).data
+
+        return StreamingHttpResponse(
+            renderer.stream(chunks()), content_type=renderer.media_type
+        )
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .compiled import CompiledSerializer
 from .models import Image
 
 
@@ -7,3 +8,32 @@ class ImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Image
         fields = ["id", "image"]
+
+
+class CompiledImageSerializer(CompiledSerializer):
+    serializer_class = ImageSerializer
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """``PrimaryKeyRelatedField(many=True)`` looking all the ids up in one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        child = self.child_relation
+        for pk in data:
+            if isinstance(pk, bool):
+                child.fail("incorrect_type", data_type=type(pk).__name__)
+        try:
+            found = child.get_queryset().in_bulk(data)
+        except (TypeError, ValueError):
+            child.fail("incorrect_type", data_type=type(data[0]).__name__)
+        found = {str(pk): obj for pk, obj in found.items()}
+        objects = []
+        for pk in data:
+            if str(pk) not in found:
+                child.fail("does_not_exist", pk_value=pk)
+            objects.append(found[str(pk)])
+        return objects
@@ -0,0 +1,139 @@
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+
+# Aliases the engagement tables (reactions and follows) are spread over. Each
+# sharded model names, as ``shard_key``, the foreign key whose id picks its
+# shard, so all rows of one owner live together. Empty keeps them in default.
+SHARD_DATABASES = getattr(settings, "SHARD_DATABASES", [])
+
+
+def shard_for(key):
+    """The alias holding rows owned by ``key``; stable across processes."""
+    if not SHARD_DATABASES:
+        return "default"
+    return SHARD_DATABASES[zlib.crc32(str(key).encode()) % len(SHARD_DATABASES)]
+
+
+_moving = ContextVar("moving", default=False)
+
+
+@contextmanager
+def moving():
+    """Mark deletes inside the block as rows moving between shards, which
+    delete receivers should not treat as the rows going away."""
+    token = _moving.set(True)
+    try:
+        yield
+    finally:
+        _moving.reset(token)
+
+
+def is_moving():
+    return _moving.get()
+
+
+def is_sharded(model):
+    return bool(SHARD_DATABASES) and hasattr(model, "shard_key")
+
+
+def sharded_models():
+    return [model for model in apps.get_models() if hasattr(model, "shard_key")]
+
+
+def fan_out(queryset):
+    """``queryset`` once per shard, for reads that span every owner."""
+    if not is_sharded(queryset.model):
+        return [queryset]
+    return [queryset.using(alias) for alias in SHARD_DATABASES]
+
+
+def per_shard(queryset, field, keys):
+    """``queryset.filter(<field>__in=keys)`` split into one query per shard."""
+    if not is_sharded(queryset.model):
+        return [queryset.filter(**{f"{field}__in": keys})]
+    groups = defaultdict(list)
+    for key in keys:
+        groups[shard_for(key)].append(key)
+    return [
+        queryset.using(alias).filter(**{f"{field}__in": group})
+        for alias, group in groups.items()
+    ]
+
+
+def _shard_from_lookups(model, lookups):
+    key = model.shard_key
+    for lookup in (key, f"{key}_id", f"{key}__id", f"{key}__pk"):
+        if lookup in lookups:
+            value = lookups[lookup]
+            return shard_for(getattr(value, "pk", value))
+    return None
+
+
+class ShardedQuerySet(models.QuerySet):
+    """Routes itself to the owner's shard when filtered or created by owner.
+
+    Queries over many owners need ``fan_out`` or ``per_shard``.
+    """
+
+    def filter(self, *args, **kwargs):
+        clone = super().filter(*args, **kwargs)
+        if clone._db is None and is_sharded(self.model):
+            clone._db = _shard_from_lookups(self.model, kwargs)
+        return clone
+
+    def create(self, **kwargs):
+        if self._db is None and is_sharded(self.model):
+            alias = _shard_from_lookups(self.model, kwargs)
+            if alias is not None:
+                return self.using(alias).create(**kwargs)
+        return super().create(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if self._db is not None or not is_sharded(self.model):
+            return super().bulk_create(objs, *args, **kwargs)
+        attname = self.model._meta.get_field(self.model.shard_key).attname
+        groups = defaultdict(list)
+        for obj in objs:
+            groups[shard_for(getattr(obj, attname))].append(obj)
+        return [
+            created
+            for alias, group in groups.items()
+            for created in self.using(alias).bulk_create(group, *args, **kwargs)
+        ]
+
+
+class ShardedManager(models.Manager.from_queryset(ShardedQuerySet)):
+    pass
+
+
+class ShardRouter:
+    def _shard_of(self, model, hints):
+        instance = hints.get("instance")
+        if is_sharded(model) and isinstance(instance, model):
+            attname = model._meta.get_field(model.shard_key).attname
+            return shard_for(getattr(instance, attname))
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._shard_of(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._shard_of(model, hints)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == "default" or db not in SHARD_DATABASES:
+            return None
+        # Shards only hold the sharded tables.
+        if model_name is None:
+            return False
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            return False
+        return hasattr(model, "shard_key")
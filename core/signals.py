@@ -0,0 +1,26 @@
+from functools import partial
+
+from django.db.models.signals import post_delete
+
+from . import shards
+
+
+def delete_shard_rows(model, field, sender, instance, **kwargs):
+    for queryset in shards.fan_out(model.objects.filter(**{field: instance.pk})):
+        queryset.delete()
+
+
+def connect_shard_cleanup():
+    """Delete the sharded rows pointing to a deleted object, as the foreign keys
+    shards leave unenforced would have."""
+    if not shards.SHARD_DATABASES:
+        return
+    for model in shards.sharded_models():
+        for field in model._meta.get_fields():
+            if field.many_to_one and field.concrete:
+                post_delete.connect(
+                    partial(delete_shard_rows, model, field.attname),
+                    sender=field.related_model,
+                    weak=False,
+                    dispatch_uid=f"{model._meta.label_lower}.{field.name}",
+                )
@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from threads.models import ThreadReactions
+
+
+class AuditQueryPlansTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def audit(self, *args):
+        stdout = StringIO()
+        call_command("audit_query_plans", "--check", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_every_endpoint_uses_an_index(self):
+        self.audit()
+
+    def drop_indexes(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = %s AND sql IS NOT NULL",
+                [table],
+            )
+            for (name,) in cursor.fetchall():
+                cursor.execute(f'DROP INDEX "{name}"')
+
+    def test_missing_indexes_fail_the_check(self):
+        self.drop_indexes(ThreadReactions._meta.db_table)
+
+        with self.assertRaises(CommandError):
+            self.audit()
+
+    def test_allowed_tables_pass_the_check(self):
+        table = ThreadReactions._meta.db_table
+        self.drop_indexes(table)
+
+        self.audit("--allow", table)
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import serializers
+
+from core.compiled import CompiledSerializer
+from core.models import Image
+from threads.models import Thread, ThreadReactions
+from threads.serializers import (
+    CompiledThreadReactionsSerializer,
+    ThreadReactionsSerializer,
+)
+from users.models import User
+from users.serializers import CompiledUserListSerializer, UserListSerializer
+
+
+class CompiledSerializerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="pictured", is_verified=True)
+        self.user.avatar = Image.objects.create(
+            image="images/avatar.png", created_by=self.user
+        )
+        self.user.save()
+        User.objects.create(username="plain")
+        self.users = User.objects.select_related("avatar").order_by("id")
+
+    def test_instances_render_like_drf(self):
+        self.assertEqual(
+            CompiledUserListSerializer(self.users, many=True).data,
+            UserListSerializer(self.users, many=True).data,
+        )
+
+    def test_values_rows_render_like_drf(self):
+        rows = self.users.values(
+            "id", "username", "is_verified", "avatar__id", "avatar__image"
+        )
+
+        self.assertEqual(
+            CompiledUserListSerializer(rows, many=True).data,
+            UserListSerializer(self.users, many=True).data,
+        )
+
+    def test_embedded_user_cards_render_like_drf(self):
+        thread = Thread.objects.create(user=self.user, title="t", content="c")
+        ThreadReactions.objects.create(thread=thread, user=self.user, reaction="like")
+        reactions = ThreadReactions.objects.all()
+
+        self.assertEqual(
+            CompiledThreadReactionsSerializer(reactions, many=True).data,
+            [
+                dict(item)
+                for item in ThreadReactionsSerializer(reactions, many=True).data
+            ],
+        )
+
+    def test_method_fields_are_rejected(self):
+        class MethodSerializer(serializers.Serializer):
+            name = serializers.SerializerMethodField()
+
+        class CompiledMethodSerializer(CompiledSerializer):
+            serializer_class = MethodSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            CompiledMethodSerializer.instance_function()
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from threads.models import Comment, Thread
+from users.models import User
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/threads/threads/{self.thread.id}/comments/"
+
+    def add_comments(self, count):
+        Comment.objects.bulk_create(
+            Comment(
+                thread=self.thread, user=self.user, content="c", comment_type="text"
+            )
+            for _ in range(count)
+        )
+        return list(Comment.objects.order_by("created_at", "id"))
+
+    def walk(self, url):
+        ids = []
+        while url:
+            body = self.client.get(url).json()
+            ids += [comment["id"] for comment in body["results"]]
+            url = body["next"]
+        return ids
+
+    def test_cursors_walk_every_row_once(self):
+        comments = self.add_comments(45)
+
+        self.assertEqual(self.walk(self.url), [comment.id for comment in comments])
+
+    def test_rows_with_the_same_timestamp_are_split_by_id(self):
+        self.add_comments(25)
+        Comment.objects.update(created_at=timezone.now())
+
+        ids = self.walk(self.url)
+
+        self.assertEqual(ids, sorted(Comment.objects.values_list("id", flat=True)))
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import db
+from core.db import ReadRouter
+from threads.models import Thread
+from users.models import User
+
+
+@mock.patch.object(db, "READ_DATABASES", ["read"])
+class ReadRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def routed_reads(self, method, url, **kwargs):
+        """Aliases the router picked for each read; all are run on default."""
+        aliases = []
+        pick = ReadRouter.db_for_read
+
+        def record(router, model, **hints):
+            aliases.append(pick(router, model, **hints))
+            return "default"
+
+        with mock.patch.object(ReadRouter, "db_for_read", record):
+            getattr(self.client, method)(url, **kwargs)
+        return set(aliases)
+
+    def test_read_actions_use_the_read_connection(self):
+        aliases = self.routed_reads("get", f"/api/threads/threads/{self.thread.id}/")
+
+        self.assertEqual(aliases, {"read"})
+
+    def test_writes_and_their_reads_use_the_primary(self):
+        aliases = self.routed_reads(
+            "patch",
+            f"/api/threads/threads/{self.thread.id}/",
+            data={"title": "new"},
+            format="json",
+        )
+
+        self.assertEqual(aliases, {"default"})
+
+    def test_read_connections_are_not_migrated(self):
+        router = ReadRouter()
+
+        self.assertIs(router.allow_migrate("read", "threads"), False)
+        self.assertIsNone(router.allow_migrate("default", "threads"))
@@ -0,0 +1,68 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import renderers
+from core.renderers import FastJSONRenderer
+from threads.models import Thread
+from threads.views import ThreadViewSet
+from users.models import User
+
+DATA = {"text": "naïve ✓", "price": Decimal("1.50"), "nested": [{1: None}, True]}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_the_json_renderer(self):
+        expected = JSONRenderer().render(DATA)
+
+        self.assertEqual(FastJSONRenderer().render(DATA), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(DATA), expected)
+
+    def test_indented_responses_use_the_json_renderer(self):
+        context = {"indent": 2}
+
+        self.assertEqual(
+            FastJSONRenderer().render(DATA, renderer_context=context),
+            JSONRenderer().render(DATA, renderer_context=context),
+        )
+
+    def test_stream_joins_chunks_into_one_array(self):
+        renderer = FastJSONRenderer()
+
+        for chunks in ([], [[]], [[1, 2], [], [3]]):
+            with self.subTest(chunks=chunks):
+                streamed = b"".join(renderer.stream(iter(chunks)))
+                self.assertEqual(
+                    json.loads(streamed), [item for chunk in chunks for item in chunk]
+                )
+
+
+class StreamingListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        Thread.objects.bulk_create(
+            Thread(user=self.user, title=str(index), content="c") for index in range(5)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @mock.patch.object(ThreadViewSet, "stream_chunk_size", 2)
+    def test_thread_list_is_streamed_in_chunks(self):
+        response = self.client.get("/api/threads/threads/")
+
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(sorted(thread["title"] for thread in body), list("01234"))
+
+    def test_browsable_api_gets_the_full_response(self):
+        response = self.client.get("/api/threads/threads/", HTTP_ACCEPT="text/html")
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.data), 5)
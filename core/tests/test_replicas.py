@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import db
+from threads.models import Thread
+from users.models import User
+
+REPLICAS = ["replica0", "replica1"]
+
+
+@mock.patch.object(db, "READ_DATABASES", REPLICAS)
+class ReplicaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="writer")
+
+    def test_reads_are_spread_over_the_replicas(self):
+        picked = {db.read_database(self.user.pk) for _ in range(50)}
+
+        self.assertEqual(picked, set(REPLICAS))
+
+    def test_writers_stick_to_the_primary(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        client.post(
+            "/api/threads/threads/", {"title": "t", "content": "c"}, format="json"
+        )
+
+        self.assertTrue(Thread.objects.exists())
+        self.assertEqual(db.read_database(self.user.pk), "default")
+        self.assertIn(db.read_database(), REPLICAS)
+
+    def test_primary_only_overrides_the_replicas(self):
+        with db.primary_only():
+            self.assertEqual(db.read_database(), "default")
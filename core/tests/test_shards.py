@@ -0,0 +1,111 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from core import shards
+from core.shards import ShardRouter
+from threads.models import Thread, ThreadReactions
+from users.models import Followers, User
+
+SHARDS = ["shard0", "shard1"]
+
+
+@mock.patch.object(shards, "SHARD_DATABASES", SHARDS)
+class ShardRoutingTests(SimpleTestCase):
+    def test_owners_map_to_a_stable_shard(self):
+        aliases = {shards.shard_for(key) for key in range(20)}
+
+        self.assertEqual(aliases, set(SHARDS))
+        self.assertEqual(shards.shard_for(7), shards.shard_for("7"))
+
+    def test_per_shard_splits_keys_by_owner(self):
+        keys = list(range(10))
+
+        querysets = shards.per_shard(ThreadReactions.objects.all(), "thread_id", keys)
+
+        self.assertEqual(
+            {queryset.db for queryset in querysets}, {shards.shard_for(k) for k in keys}
+        )
+        for queryset in querysets:
+            (lookup,) = queryset.query.where.children
+            self.assertTrue(
+                all(shards.shard_for(key) == queryset.db for key in lookup.rhs)
+            )
+
+    def test_unsharded_models_stay_in_default(self):
+        self.assertEqual(
+            [queryset.db for queryset in shards.fan_out(Thread.objects.all())],
+            ["default"],
+        )
+        self.assertEqual(
+            [queryset.db for queryset in shards.fan_out(ThreadReactions.objects.all())],
+            SHARDS,
+        )
+
+    def test_filtering_by_owner_picks_its_shard(self):
+        queryset = ThreadReactions.objects.filter(thread_id=3)
+
+        self.assertEqual(queryset.db, shards.shard_for(3))
+
+    def test_shards_only_migrate_sharded_tables(self):
+        router = ShardRouter()
+
+        self.assertTrue(router.allow_migrate("shard0", "threads", "threadreactions"))
+        self.assertFalse(router.allow_migrate("shard0", "threads", "thread"))
+        self.assertFalse(router.allow_migrate("shard0", "threads"))
+        self.assertIsNone(router.allow_migrate("default", "threads", "thread"))
+
+
+class ShardMoveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.follow = Followers.objects.create(
+            follower=User.objects.create(username="a"),
+            following=User.objects.create(username="b"),
+        )
+
+    @mock.patch("users.signals.graph")
+    def test_rows_moving_between_shards_are_not_unfollows(self, graph):
+        with self.captureOnCommitCallbacks(execute=True), shards.moving():
+            self.follow.delete()
+
+        graph.unfollow.assert_not_called()
+
+    @mock.patch("users.signals.graph")
+    def test_deleted_follows_are_unfollows(self, graph):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.follow.delete()
+
+        graph.unfollow.assert_called_once_with(
+            self.follow.follower_id, self.follow.following_id
+        )
+
+
+class ReshardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="a")
+        thread = Thread.objects.create(user=user, title="t", content="c")
+        ThreadReactions.objects.create(thread=thread, user=user, reaction="like")
+
+    def reshard(self, *args):
+        stdout = StringIO()
+        call_command("reshard", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_rows_already_in_place_stay(self):
+        self.assertIn("Moved 0 threads.ThreadReactions rows", self.reshard())
+
+    @mock.patch.object(shards, "SHARD_DATABASES", SHARDS)
+    def test_dry_run_counts_rows_without_moving_them(self):
+        output = self.reshard("--source", "default", "--dry-run")
+
+        self.assertIn("Would move 1 threads.ThreadReactions rows", output)
+        self.assertEqual(ThreadReactions.objects.using("default").count(), 1)
+
+    def test_unknown_sources_are_rejected(self):
+        with self.assertRaises(CommandError):
+            self.reshard("--source", "missing")
@@ -7,18 +7,24 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 
 from .models import Image
+from .queries import QueryBudgetMixin, budgets
 from .serializers import ImageSerializer
 
 
 class ImageViewSet(
-    CreateModelMixin, DestroyModelMixin, RetrieveModelMixin, GenericViewSet
+    QueryBudgetMixin,
+    CreateModelMixin,
+    DestroyModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
 ):
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
+    query_budgets = budgets(retrieve=1)
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.request.user.images.all()
+        return Image.objects.filter(created_by=self.request.user)
 
     def perform_destroy(self, instance):
         instance.is_deleted = True
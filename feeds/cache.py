@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+FEED_CACHE_TIMEOUT = getattr(settings, "FEED_CACHE_TIMEOUT", 60)
+EXPLORE_CACHE_TIMEOUT = getattr(settings, "EXPLORE_CACHE_TIMEOUT", 60)
+# Explore pages are recomputed by one request once they are this close to
+# expiring, while everyone else keeps getting the cached copy.
+EXPLORE_REFRESH_AHEAD = getattr(settings, "EXPLORE_REFRESH_AHEAD", 15)
+
+
+def _version_key(user_id):
+    return f"feed:version:{user_id}"
+
+
+def feed_version(user_id):
+    return cache.get(_version_key(user_id), 0)
+
+
+def invalidate_feeds(user_ids):
+    """Bump the feed version of every user so their cached pages are skipped."""
+    version = time.time_ns()
+    cache.set_many({_version_key(user_id): version for user_id in user_ids}, None)
+
+
+def feed_key(user_id, sort, cursor):
+    return f"feed:{user_id}:{feed_version(user_id)}:{sort or ''}:{cursor or ''}"
+
+
+def explore_key(cursor):
+    return f"explore:{cursor or ''}"
+
+
+def record(name, hit):
+    key = f"feed-cache:{name}:{'hits' if hit else 'misses'}"
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def _stats_keys():
+    return {
+        (name, kind): f"feed-cache:{name}:{kind}"
+        for name in ("feed", "explore")
+        for kind in ("hits", "misses")
+    }
+
+
+def stats():
+    keys = _stats_keys()
+    values = cache.get_many(keys.values())
+    result = {}
+    for (name, kind), key in keys.items():
+        result.setdefault(name, {})[kind] = values.get(key, 0)
+    return result
+
+
+def reset_stats():
+    cache.delete_many(_stats_keys().values())
+
+
+def get_feed_page(key, compute):
+    data = cache.get(key)
+    record("feed", data is not None)
+    if data is None:
+        data = compute()
+        cache.set(key, data, FEED_CACHE_TIMEOUT)
+    return data
+
+
+def get_explore_page(key, compute):
+    entry = cache.get(key)
+    record("explore", entry is not None)
+    if entry is not None:
+        refresh_at, data = entry
+        # Only the request that wins the lock recomputes the page early.
+        if time.time() < refresh_at or not cache.add(f"{key}:lock", 1, 30):
+            return data
+    data = compute()
+    refresh_at = time.time() + EXPLORE_CACHE_TIMEOUT - EXPLORE_REFRESH_AHEAD
+    cache.set(key, (refresh_at, data), EXPLORE_CACHE_TIMEOUT)
+    cache.delete(f"{key}:lock")
+    return data
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from feeds import cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for the feed and explore caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true")
+
+    def handle(self, *args, **options):
+        for name, counts in cache.stats().items():
+            total = counts["hits"] + counts["misses"]
+            ratio = counts["hits"] / total if total else 0
+            self.stdout.write(
+                f"{name}: {counts['hits']} hits, {counts['misses']} misses "
+                f"({ratio:.1%} hit rate)"
+            )
+        if options["reset"]:
+            cache.reset_stats()
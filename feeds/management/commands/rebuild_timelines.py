@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from feeds import timeline
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuild materialized home timelines from the follow graph"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="*", type=int)
+        parser.add_argument("--limit", type=int, default=timeline.TIMELINE_BACKFILL)
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("id")
+        if options["user_ids"]:
+            users = users.filter(id__in=options["user_ids"])
+        # Settle who is fanned out before filling timelines from it.
+        for user_id in users.values_list("id", flat=True).iterator():
+            timeline.update_fanout(user_id)
+        count = 0
+        for user_id in users.values_list("id", flat=True).iterator():
+            timeline.rebuild(user_id, limit=options["limit"])
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} timelines"))
@@ -1 +1,38 @@
-# Create your models here.
+from django.db import models
+
+from threads.models import Thread
+from users.models import User
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    thread = models.ForeignKey(
+        Thread, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.owner} ← {self.thread}"
+
+    class Meta:
+        unique_together = ("owner", "thread")
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-thread"]),
+            models.Index(fields=["owner", "author"]),
+        ]
+
+
+class HighFanoutAuthor(models.Model):
+    """An account whose threads are merged into its followers' feeds at read
+    time rather than fanned out to their timelines (see feeds.timeline)."""
+
+    author = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return str(self.author)
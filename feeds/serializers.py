@@ -1,14 +1,14 @@
 from rest_framework import serializers
 
-from core.serializers import ImageSerializer
+from core.compiled import CompiledSerializer, Nested
+from core.serializers import CompiledImageSerializer, ImageSerializer
+from threads import reactions
 from threads.models import Thread
-from users.serializers import UserListSerializer
+from users.serializers import UserCardField
 
 
 class FeedThreadSerializer(serializers.ModelSerializer):
-    user = UserListSerializer(read_only=True)
-    reactions_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    user = UserCardField()
 
     class Meta:
         model = Thread
@@ -22,12 +22,15 @@ class FeedThreadSerializer(serializers.ModelSerializer):
             "reactions_count",
             "comments_count",
         ]
+        read_only_fields = ["reactions_count", "comments_count"]
 
-    def get_reactions_count(self, obj):
-        return obj.reactions.count()
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    @staticmethod
+    def with_reactions(results, user):
+        """Add ``reaction_counts`` and ``my_reaction`` to rendered threads."""
+        summaries = reactions.summaries(
+            "thread", [item["id"] for item in results], user.pk
+        )
+        return [{**item, **summaries[item["id"]]} for item in results]
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -37,3 +40,36 @@ class FeedThreadSerializer(serializers.ModelSerializer):
         else:
             representation["images"] = None
         return representation
+
+
+class CompiledFeedThreadSerializer(CompiledSerializer):
+    serializer_class = FeedThreadSerializer
+    nested = {"images": Nested(CompiledImageSerializer, many=True, empty=None)}
+    # Exactly the columns the representation reads; images are added by
+    # prepare_rows and authors come from the user card cache.
+    columns = (
+        "id",
+        "title",
+        "content",
+        "created_at",
+        "reactions_count",
+        "comments_count",
+        "user_id",
+    )
+
+    @classmethod
+    def values(cls, queryset, *extra_fields):
+        return queryset.values(*cls.columns, *extra_fields)
+
+    @classmethod
+    def prepare_rows(cls, rows):
+        pending = {row["id"]: row for row in rows if "images" not in row}
+        for row in pending.values():
+            row["images"] = []
+        links = (
+            Thread.images.through.objects.filter(thread_id__in=pending)
+            .order_by("id")
+            .values_list("thread_id", "image__id", "image__image")
+        )
+        for thread_id, image_id, image in links:
+            pending[thread_id]["images"].append({"id": image_id, "image": image})
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from threads.deletion import threads_deleted, threads_restored
+from threads.models import Thread
+from users.models import Followers
+
+from . import cache, timeline
+from .serializers import CompiledFeedThreadSerializer
+
+# Saves touching none of these leave every cached feed page as it was.
+FEED_FIELDS = {
+    *CompiledFeedThreadSerializer.columns,
+    "user",
+    "hot_score",
+    "is_deleted",
+}
+
+
+def invalidate_readers(author_ids):
+    """Drop the cached feed pages of the authors and of all their followers,
+    high-fanout authors included."""
+    user_ids = set(author_ids)
+    for author_id in author_ids:
+        user_ids.update(timeline.follower_ids(author_id))
+    cache.invalidate_feeds(user_ids)
+
+
+@receiver(post_save, sender=Thread)
+def fan_out_thread(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        cache.invalidate_feeds(timeline.push_thread(instance))
+    elif update_fields is None or FEED_FIELDS & set(update_fields):
+        invalidate_readers([instance.user_id])
+
+
+@receiver(threads_deleted)
+@receiver(threads_restored)
+def invalidate_on_delete_or_restore(sender, thread_ids, **kwargs):
+    invalidate_readers(
+        set(
+            Thread.all_objects.filter(id__in=thread_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+    )
+
+
+@receiver(post_save, sender=Followers)
+def sync_timeline_on_follow(sender, instance, created, **kwargs):
+    if instance.unfollowed_at is not None:
+        timeline.prune(instance.follower_id, instance.following_id)
+    elif created:
+        timeline.backfill(instance.follower_id, instance.following_id)
+    cache.invalidate_feeds(
+        [instance.follower_id, *timeline.update_fanout(instance.following_id)]
+    )
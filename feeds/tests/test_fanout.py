@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from feeds import timeline
+from feeds.models import HighFanoutAuthor, TimelineEntry
+from threads.models import Thread
+from users.models import Followers, User
+
+
+@mock.patch.object(timeline, "FANOUT_FOLLOWER_THRESHOLD", 3)
+@mock.patch.object(timeline, "FANOUT_FOLLOWER_THRESHOLD_LOW", 2)
+class HybridFanoutTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create(username="author")
+        self.followers = [
+            User.objects.create(username=f"follower-{index}") for index in range(3)
+        ]
+
+    def follow(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            Followers.objects.create(follower=user, following=self.author)
+
+    def unfollow(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            follow = Followers.objects.get(follower=user, unfollowed_at=None)
+            follow.unfollowed_at = timezone.now()
+            follow.save()
+
+    def is_high_fanout(self):
+        return HighFanoutAuthor.objects.filter(author=self.author).exists()
+
+    def test_threads_of_high_fanout_authors_are_merged_on_read(self):
+        for user in self.followers:
+            self.follow(user)
+        self.assertTrue(self.is_high_fanout())
+
+        thread = Thread.objects.create(user=self.author, title="t", content="c")
+        self.assertEqual(
+            list(TimelineEntry.objects.filter(thread=thread).values_list("owner_id")),
+            [(self.author.id,)],
+        )
+
+        client = APIClient()
+        client.force_authenticate(self.followers[0])
+        response = client.get("/api/feeds/feeds/")
+        self.assertEqual([row["id"] for row in response.json()["results"]], [thread.id])
+
+    def test_mode_switches_back_only_below_the_lower_threshold(self):
+        for user in self.followers:
+            self.follow(user)
+        thread = Thread.objects.create(user=self.author, title="t", content="c")
+
+        self.unfollow(self.followers[2])
+        self.assertTrue(self.is_high_fanout())
+
+        self.unfollow(self.followers[1])
+        self.assertFalse(self.is_high_fanout())
+        # The remaining follower gets the threads that were never fanned out.
+        self.assertTrue(
+            TimelineEntry.objects.filter(
+                owner=self.followers[0], thread=thread
+            ).exists()
+        )
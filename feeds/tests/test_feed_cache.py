@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from feeds import cache as feed_cache
+from threads import deletion
+from threads.models import Thread
+from users.models import Followers, User
+
+
+class FeedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create(username="reader")
+        self.author = User.objects.create(username="author")
+        Followers.objects.create(follower=self.reader, following=self.author)
+        self.thread = Thread.objects.create(user=self.author, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def titles(self):
+        response = self.client.get("/api/feeds/feeds/")
+        return [thread["title"] for thread in response.json()["results"]]
+
+    def test_pages_are_served_from_the_cache(self):
+        self.assertEqual(self.titles(), ["t"])
+        Thread.objects.update(title="changed")
+
+        self.assertEqual(self.titles(), ["t"])
+        self.assertEqual(feed_cache.stats()["feed"], {"hits": 1, "misses": 1})
+
+    def test_new_and_edited_threads_invalidate_followers(self):
+        self.assertEqual(self.titles(), ["t"])
+
+        self.thread.title = "edited"
+        self.thread.save()
+        self.assertEqual(self.titles(), ["edited"])
+
+        Thread.objects.create(user=self.author, title="new", content="c")
+        self.assertEqual(self.titles(), ["new", "edited"])
+
+    def test_saves_of_fields_the_feed_does_not_show_keep_the_cache(self):
+        version = feed_cache.feed_version(self.reader.id)
+
+        self.thread.save(update_fields=["cover_image"])
+        self.assertEqual(feed_cache.feed_version(self.reader.id), version)
+
+        self.thread.save(update_fields=["title"])
+        self.assertNotEqual(feed_cache.feed_version(self.reader.id), version)
+
+    def test_deleted_threads_leave_the_feed(self):
+        self.assertEqual(self.titles(), ["t"])
+
+        deletion.delete_threads([self.thread.id])
+
+        self.assertEqual(self.titles(), [])
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import Image
+from feeds.serializers import CompiledFeedThreadSerializer, FeedThreadSerializer
+from threads.models import Thread
+from users.models import User
+
+
+class FeedProjectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        image = Image.objects.create(image="images/test.png", created_by=self.user)
+        Thread.objects.create(user=self.user, title="plain", content="c")
+        Thread.objects.create(user=self.user, title="pictured", content="c").images.add(
+            image
+        )
+
+    def test_values_rows_render_like_the_model_serializer(self):
+        queryset = Thread.objects.order_by("id")
+
+        compiled = CompiledFeedThreadSerializer(
+            CompiledFeedThreadSerializer.values(queryset), many=True
+        ).data
+        expected = FeedThreadSerializer(
+            queryset.select_related("user").prefetch_related("images"), many=True
+        ).data
+
+        self.assertEqual(compiled, [dict(item) for item in expected])
+        self.assertIsNone(compiled[0]["images"])
+        self.assertEqual(len(compiled[1]["images"]), 1)
+
+    def test_rows_are_built_from_the_listed_columns_only(self):
+        with self.assertNumQueries(2):
+            rows = list(CompiledFeedThreadSerializer.values(Thread.objects.all()))
+            CompiledFeedThreadSerializer.prepare_rows(rows)
+
+        self.assertEqual(
+            set(rows[0]), {*CompiledFeedThreadSerializer.columns, "images"}
+        )
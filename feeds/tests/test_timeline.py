@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from feeds.models import TimelineEntry
+from threads.models import Thread
+from users.models import Followers, User
+
+
+class TimelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create(username="reader")
+        self.author = User.objects.create(username="author")
+        self.follow = Followers.objects.create(
+            follower=self.reader, following=self.author
+        )
+
+    def owners(self, thread):
+        return set(
+            TimelineEntry.objects.filter(thread=thread).values_list(
+                "owner_id", flat=True
+            )
+        )
+
+    def test_new_threads_fan_out_to_the_author_and_followers(self):
+        thread = Thread.objects.create(user=self.author, title="t", content="c")
+
+        self.assertEqual(self.owners(thread), {self.author.id, self.reader.id})
+
+    def test_unfollow_prunes_and_follow_backfills(self):
+        thread = Thread.objects.create(user=self.author, title="t", content="c")
+
+        self.follow.unfollowed_at = timezone.now()
+        self.follow.save()
+        self.assertEqual(self.owners(thread), {self.author.id})
+
+        other = User.objects.create(username="other")
+        Followers.objects.create(follower=other, following=self.author)
+        self.assertEqual(self.owners(thread), {self.author.id, other.id})
+
+    def test_feed_lists_followed_threads_newest_first(self):
+        first = Thread.objects.create(user=self.author, title="1", content="c")
+        second = Thread.objects.create(user=self.author, title="2", content="c")
+        stranger = User.objects.create(username="stranger")
+        Thread.objects.create(user=stranger, title="s", content="c")
+        client = APIClient()
+        client.force_authenticate(self.reader)
+
+        response = client.get("/api/feeds/feeds/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [thread["id"] for thread in response.json()["results"]],
+            [second.id, first.id],
+        )
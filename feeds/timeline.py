@@ -0,0 +1,222 @@
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from core import shards
+from threads.models import Thread
+from users.graph import graph
+from users.models import Followers
+
+from .models import HighFanoutAuthor, TimelineEntry
+
+# How many of a followee's most recent threads are copied into a timeline
+# when the follow starts (or when a timeline is rebuilt).
+TIMELINE_BACKFILL = getattr(settings, "FEED_TIMELINE_BACKFILL", 200)
+# Accounts that reach this many followers are no longer fanned out on write;
+# their threads are merged into followers' feeds at read time instead. They
+# only go back to fan-out once they drop below the lower threshold, so an
+# account hovering around the limit does not flip on every follow.
+FANOUT_FOLLOWER_THRESHOLD = getattr(settings, "FEED_FANOUT_FOLLOWER_THRESHOLD", 5000)
+FANOUT_FOLLOWER_THRESHOLD_LOW = getattr(
+    settings, "FEED_FANOUT_FOLLOWER_THRESHOLD_LOW", FANOUT_FOLLOWER_THRESHOLD * 4 // 5
+)
+# How long processes may keep using the set of high-fanout accounts after an
+# account switched.
+HIGH_FANOUT_CACHE_TIMEOUT = getattr(settings, "FEED_HIGH_FANOUT_CACHE_TIMEOUT", 60)
+HIGH_FANOUT_KEY = "feed:high-fanout-ids"
+
+
+def high_fanout_ids():
+    ids = cache.get(HIGH_FANOUT_KEY)
+    if ids is None:
+        ids = frozenset(HighFanoutAuthor.objects.values_list("author_id", flat=True))
+        cache.set(HIGH_FANOUT_KEY, ids, HIGH_FANOUT_CACHE_TIMEOUT)
+    return ids
+
+
+def is_high_fanout(user_id):
+    return user_id in high_fanout_ids()
+
+
+def high_fanout_following_ids(owner_id):
+    high_fanout = high_fanout_ids()
+    if not high_fanout:
+        return []
+    return [
+        user_id for user_id in graph.following_ids(owner_id) if user_id in high_fanout
+    ]
+
+
+def _followers(author_id):
+    # Read from the database rather than the follow graph: a follower missing
+    # from a stale copy of the graph would never get the thread.
+    return shards.fan_out(
+        Followers.objects.filter(following_id=author_id, unfollowed_at__isnull=True)
+    )
+
+
+def follower_ids(author_id):
+    return [
+        follower_id
+        for queryset in _followers(author_id)
+        for follower_id in queryset.values_list("follower_id", flat=True)
+    ]
+
+
+def follower_count(author_id):
+    return sum(queryset.count() for queryset in _followers(author_id))
+
+
+def update_fanout(author_id):
+    """Switch the author between fan-out on write and merge on read once their
+    follower count crossed a threshold.
+
+    An author going back to fan-out has their recent threads copied into every
+    follower's timeline. Returns the ids of the timelines that were written to.
+    """
+    count = follower_count(author_id)
+    owner_ids = []
+    if not is_high_fanout(author_id):
+        if count < FANOUT_FOLLOWER_THRESHOLD:
+            return owner_ids
+        HighFanoutAuthor.objects.get_or_create(author_id=author_id)
+    else:
+        if count >= FANOUT_FOLLOWER_THRESHOLD_LOW:
+            return owner_ids
+        HighFanoutAuthor.objects.filter(author_id=author_id).delete()
+        owner_ids = follower_ids(author_id)
+        _fill(owner_ids, author_id)
+    transaction.on_commit(lambda: cache.delete(HIGH_FANOUT_KEY))
+    return owner_ids
+
+
+def _entry(owner_id, thread):
+    return TimelineEntry(
+        owner_id=owner_id,
+        thread_id=thread.id,
+        author_id=thread.user_id,
+        created_at=thread.created_at,
+    )
+
+
+def push_thread(thread):
+    """Fan a newly created thread out to its author and every active follower.
+
+    Threads of high-fanout accounts only go to the author's own timeline.
+    Returns the ids of the timelines that were written to.
+    """
+    owner_ids = [thread.user_id]
+    if not is_high_fanout(thread.user_id):
+        owner_ids += follower_ids(thread.user_id)
+    TimelineEntry.objects.bulk_create(
+        [_entry(owner_id, thread) for owner_id in owner_ids],
+        ignore_conflicts=True,
+    )
+    return owner_ids
+
+
+def _fill(owner_ids, author_id, limit=TIMELINE_BACKFILL, chunk_size=100):
+    threads = list(
+        Thread.objects.filter(user_id=author_id).order_by("-created_at")[:limit]
+    )
+    if not threads:
+        return
+    for start in range(0, len(owner_ids), chunk_size):
+        TimelineEntry.objects.bulk_create(
+            [
+                _entry(owner_id, thread)
+                for owner_id in owner_ids[start : start + chunk_size]
+                for thread in threads
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def backfill(owner_id, author_id, limit=TIMELINE_BACKFILL):
+    if owner_id != author_id and is_high_fanout(author_id):
+        return
+    _fill([owner_id], author_id, limit=limit)
+
+
+def prune(owner_id, author_id):
+    TimelineEntry.objects.filter(owner_id=owner_id, author_id=author_id).delete()
+
+
+def rebuild(owner_id, limit=TIMELINE_BACKFILL):
+    TimelineEntry.objects.filter(owner_id=owner_id).delete()
+    for author_id in graph.following_ids(owner_id) + [owner_id]:
+        backfill(owner_id, author_id, limit=limit)
+
+
+def timeline(owner_id, oldest_first=False):
+    ordering = (
+        ("created_at", "thread_id") if oldest_first else ("-created_at", "-thread_id")
+    )
+    return TimelineEntry.objects.filter(owner_id=owner_id).order_by(*ordering)
+
+
+def _after(position, oldest_first, id_field):
+    if position is None:
+        return Q()
+    created_at, thread_id = position
+    lookup = "gt" if oldest_first else "lt"
+    return Q(**{f"created_at__{lookup}": created_at}) | Q(
+        created_at=created_at, **{f"{id_field}__{lookup}": thread_id}
+    )
+
+
+def read_page(owner_id, limit, position=None, oldest_first=False):
+    """Return up to ``limit`` ``(created_at, thread_id)`` rows after ``position``.
+
+    The owner's materialized timeline and the recent threads of every
+    high-fanout account they follow are each read with a bounded, index-backed
+    seek and combined with a k-way merge.
+    """
+    direction = "" if oldest_first else "-"
+    sources = [
+        timeline(owner_id, oldest_first)
+        .filter(_after(position, oldest_first, "thread_id"))
+        .values_list("created_at", "thread_id")[:limit]
+    ]
+    for author_id in high_fanout_following_ids(owner_id):
+        sources.append(
+            Thread.objects.filter(user_id=author_id)
+            .filter(_after(position, oldest_first, "id"))
+            .order_by(f"{direction}created_at", f"{direction}id")
+            .values_list("created_at", "id")[:limit]
+        )
+
+    rows = []
+    seen = set()
+    for created_at, thread_id in heapq.merge(*sources, reverse=not oldest_first):
+        if thread_id in seen:
+            continue
+        seen.add(thread_id)
+        rows.append({"created_at": created_at, "thread_id": thread_id})
+        if len(rows) == limit:
+            break
+    return rows
+
+
+def feed_filter(owner_id):
+    return Q(
+        id__in=TimelineEntry.objects.filter(owner_id=owner_id).values("thread_id")
+    ) | Q(user_id__in=high_fanout_following_ids(owner_id))
+
+
+def hydrate(thread_ids, queryset=None):
+    """Load threads (or ``.values()`` rows) for a page of ids, keeping the order
+    of ``thread_ids``.
+
+    Ids of threads that were deleted since they were fanned out are dropped.
+    """
+    if queryset is None:
+        queryset = Thread.objects.all()
+    threads = {
+        item["id"] if isinstance(item, dict) else item.pk: item
+        for item in queryset.filter(id__in=thread_ids)
+    }
+    return [threads[thread_id] for thread_id in thread_ids if thread_id in threads]
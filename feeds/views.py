@@ -1,70 +1,117 @@
-from django.db.models import Count
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from rest_framework import viewsets
 from rest_framework.mixins import ListModelMixin
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 
+from core.db import ReadDatabaseMixin
+from core.pagination import KeysetPagination
+from core.queries import QueryBudgetMixin, budgets
 from threads.models import Thread
-from users.models import Followers
 
-from .serializers import (
-    FeedThreadSerializer,
-)  # Assume you have a thread list serializer
+from . import cache, timeline
+from .models import TimelineEntry
+from .serializers import CompiledFeedThreadSerializer, FeedThreadSerializer
 
+# Orderings of ?sort=; anything else gets the default, newest first.
+FEED_SORTS = ("comments", "reactions", "old")
 
-class FeedPagination(PageNumberPagination):
+
+class FeedPagination(KeysetPagination):
     page_size = 10
-    page_query_param = "page"
 
 
-@method_decorator(cache_page(10), name="list")
-class FeedView(viewsets.GenericViewSet, ListModelMixin):
+def with_reactions(request, data):
+    # Reactions change too often to cache with the page; ?reactions=1 adds them
+    # to the cached page on the way out.
+    if not request.query_params.get("reactions"):
+        return data
+    results = FeedThreadSerializer.with_reactions(data["results"], request.user)
+    return {**data, "results": results}
+
+
+class FeedView(
+    QueryBudgetMixin, ReadDatabaseMixin, viewsets.GenericViewSet, ListModelMixin
+):
     permission_classes = [IsAuthenticated]
-    serializer_class = FeedThreadSerializer
+    serializer_class = CompiledFeedThreadSerializer
     pagination_class = FeedPagination
+    query_budgets = budgets(list=7)
 
     def get_queryset(self):
         user = self.request.user
         sort = self.request.query_params.get("sort")
-        followed_user_ids = Followers.objects.filter(
-            follower=user, unfollowed_at__isnull=True
-        ).values_list("following_id", flat=True)
-        list_of_ids = list(followed_user_ids) + [user.id]
 
         # make table to mute and block users
 
-        qs = (
-            Thread.objects.filter(user__in=list_of_ids)
-            .select_related("user")
-            .prefetch_related("images", "comments", "reactions")
-            .order_by("-created_at")
-        )
+        qs = CompiledFeedThreadSerializer.values(
+            Thread.objects.filter(timeline.feed_filter(user.id))
+        ).order_by("-created_at")
 
         if sort == "comments":
-            qs = qs.annotate(comments_count=Count("comments")).order_by(
-                "-comments_count", "-created_at"
-            )
+            qs = qs.order_by("-comments_count", "-created_at")
             return qs
         elif sort == "reactions":
-            qs = qs.annotate(reactions_count=Count("reactions")).order_by(
-                "-reactions_count", "-created_at"
-            )
+            qs = qs.order_by("-reactions_count", "-created_at")
             return qs
         elif sort == "old":
             qs = qs.order_by("created_at")
             return qs
         return qs
 
+    def list(self, request, *args, **kwargs):
+        sort = request.query_params.get("sort")
+        if sort not in FEED_SORTS:
+            # Keep arbitrary values out of the cache key.
+            sort = None
+        key = cache.feed_key(request.user.id, sort, request.query_params.get("cursor"))
+        data = cache.get_feed_page(key, lambda: self.get_page_data(sort))
+        return Response(with_reactions(request, data))
 
-@method_decorator(cache_page(10), name="list")
-class ExploreView(viewsets.GenericViewSet, ListModelMixin):
+    def get_page_data(self, sort):
+        request = self.request
+        if sort in ("comments", "reactions"):
+            return super().list(request).data
+
+        oldest_first = sort == "old"
+        ordering = (
+            ("created_at", "thread_id")
+            if oldest_first
+            else ("-created_at", "-thread_id")
+        )
+        position = self.paginator.begin(request, ordering, TimelineEntry)
+        page = self.paginator.end(
+            timeline.read_page(
+                request.user.id,
+                self.paginator.page_size + 1,
+                position=position,
+                oldest_first=oldest_first,
+            )
+        )
+        threads = timeline.hydrate(
+            [row["thread_id"] for row in page],
+            CompiledFeedThreadSerializer.values(Thread.objects.all()),
+        )
+        serializer = self.get_serializer(threads, many=True)
+        return self.get_paginated_response(serializer.data).data
+
+
+class ExploreView(
+    QueryBudgetMixin, ReadDatabaseMixin, viewsets.GenericViewSet, ListModelMixin
+):
     permission_classes = [AllowAny]
-    serializer_class = FeedThreadSerializer
+    serializer_class = CompiledFeedThreadSerializer
     pagination_class = FeedPagination
+    query_budgets = budgets(list=5)
 
     def get_queryset(self):
-        return Thread.objects.annotate(
-            hot_score=Count("reactions") + Count("comments")
+        return CompiledFeedThreadSerializer.values(
+            Thread.objects.all(), "hot_score"
         ).order_by("-hot_score", "-created_at")
+
+    def list(self, request, *args, **kwargs):
+        key = cache.explore_key(request.query_params.get("cursor"))
+        data = cache.get_explore_page(key, self.get_page_data)
+        return Response(with_reactions(request, data))
+
+    def get_page_data(self):
+        return super().list(self.request).data
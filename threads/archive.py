@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core import shards
+from core.archive import archive
+
+from .models import (
+    Comment,
+    CommentReactions,
+    Reply,
+    ReplyReactions,
+    Thread,
+    ThreadReactions,
+)
+
+# Soft-deleted threads, comments and replies are archived this long after
+# their deletion.
+ARCHIVE_RETENTION_DAYS = getattr(settings, "ARCHIVE_RETENTION_DAYS", 30)
+
+
+def archive_reactions(model, fk, ids):
+    return sum(
+        archive(queryset)
+        for queryset in shards.per_shard(model.objects.all(), f"{fk}_id", ids)
+    )
+
+
+def archive_replies(reply_ids):
+    return archive_reactions(ReplyReactions, "reply", reply_ids) + archive(
+        Reply.all_objects.filter(id__in=reply_ids)
+    )
+
+
+def archive_comments(comment_ids):
+    reply_ids = list(
+        Reply.all_objects.filter(comment_id__in=comment_ids).values_list(
+            "id", flat=True
+        )
+    )
+    return (
+        archive_replies(reply_ids)
+        + archive_reactions(CommentReactions, "comment", comment_ids)
+        + archive(Comment.all_objects.filter(id__in=comment_ids))
+    )
+
+
+def archive_threads(thread_ids):
+    comment_ids = list(
+        Comment.all_objects.filter(thread_id__in=thread_ids).values_list(
+            "id", flat=True
+        )
+    )
+    return (
+        archive_comments(comment_ids)
+        + archive_reactions(ThreadReactions, "thread", thread_ids)
+        + archive(Thread.all_objects.filter(id__in=thread_ids))
+    )
+
+
+# Parents first, so a deleted thread takes its whole subtree with it.
+STAGES = [
+    (Thread, archive_threads),
+    (Comment, archive_comments),
+    (Reply, archive_replies),
+]
+
+
+def expired_ids(model, batch_size, retention_days=None):
+    if retention_days is None:
+        retention_days = ARCHIVE_RETENTION_DAYS
+    before = timezone.now() - timedelta(days=retention_days)
+    return list(
+        model.all_objects.filter(is_deleted=True, deleted_at__lt=before)
+        .order_by("deleted_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
@@ -0,0 +1,153 @@
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from core import shards
+
+from .models import (
+    Comment,
+    CommentReactionCount,
+    CommentReactions,
+    Reply,
+    ReplyReactionCount,
+    ReplyReactions,
+    Thread,
+    ThreadReactionCount,
+    ThreadReactions,
+)
+
+
+def adjust(model, pk, **deltas):
+    """Apply ``field=delta`` increments in one ``UPDATE``, never going below 0."""
+    model.all_objects.filter(pk=pk).update(
+        **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    )
+
+
+def _count(queryset, fk):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{fk: OuterRef("pk")})
+            .order_by()
+            .values(fk)
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+# model -> {counter field: (source queryset, foreign key to the model)}
+COUNTERS = {
+    Thread: {
+        "reactions_count": (ThreadReactions.objects.all(), "thread"),
+        "comments_count": (Comment.objects.all(), "thread"),
+    },
+    Comment: {
+        "reactions_count": (CommentReactions.objects.all(), "comment"),
+        "replies_count": (Reply.objects.all(), "comment"),
+    },
+    Reply: {
+        "reactions_count": (ReplyReactions.objects.all(), "reply"),
+    },
+}
+
+
+def _sharded_counts(queryset, fk, pks):
+    counts = Counter()
+    for part in shards.per_shard(queryset, fk, pks):
+        counts.update(dict(part.order_by().values_list(fk).annotate(Count("id"))))
+    return counts
+
+
+def reconcile(model, pks):
+    """Recompute every counter of ``model`` for the given primary keys."""
+    local = {}
+    sharded = {}
+    for field, (queryset, fk) in COUNTERS[model].items():
+        if shards.is_sharded(queryset.model):
+            sharded[field] = (queryset, fk)
+        else:
+            local[field] = _count(queryset, fk)
+    updated = model.all_objects.filter(pk__in=pks).update(**local)
+    if sharded:
+        # Rows in other databases cannot be counted in a subquery.
+        pks = list(pks)
+        counts = {
+            field: _sharded_counts(queryset, fk, pks)
+            for field, (queryset, fk) in sharded.items()
+        }
+        model.all_objects.bulk_update(
+            [
+                model(pk=pk, **{field: counts[field][pk] for field in sharded})
+                for pk in pks
+            ],
+            list(sharded),
+        )
+    return updated
+
+
+# model -> (per-type count model, reaction model, foreign key to the model)
+HISTOGRAMS = {
+    Thread: (ThreadReactionCount, ThreadReactions, "thread"),
+    Comment: (CommentReactionCount, CommentReactions, "comment"),
+    Reply: (ReplyReactionCount, ReplyReactions, "reply"),
+}
+
+
+def adjust_histograms(model, deltas):
+    """Apply ``{(pk, reaction): delta}`` to the per-type reaction counts."""
+    count_model, _, fk = HISTOGRAMS[model]
+    count_model.objects.bulk_create(
+        [
+            count_model(**{f"{fk}_id": pk}, reaction=reaction)
+            for (pk, reaction), delta in deltas.items()
+            if delta > 0
+        ],
+        ignore_conflicts=True,
+    )
+    for (pk, reaction), delta in deltas.items():
+        if delta:
+            count_model.objects.filter(**{f"{fk}_id": pk}, reaction=reaction).update(
+                count=Greatest(F("count") + delta, 0)
+            )
+
+
+def reaction_histograms(model, pks):
+    """Return ``{pk: [{"reaction", "count"}, ...]}`` for many objects at once."""
+    count_model, _, fk = HISTOGRAMS[model]
+    histograms = {pk: [] for pk in pks}
+    rows = (
+        count_model.objects.filter(**{f"{fk}_id__in": pks}, count__gt=0)
+        .order_by("reaction")
+        .values_list(f"{fk}_id", "reaction", "count")
+    )
+    for pk, reaction, count in rows:
+        histograms[pk].append({"reaction": reaction, "count": count})
+    return histograms
+
+
+def reaction_histogram(model, pk):
+    return reaction_histograms(model, [pk])[pk]
+
+
+def rebuild_histograms(model, pks):
+    """Recompute the per-type reaction counts of ``model`` from the reactions."""
+    count_model, reaction_model, fk = HISTOGRAMS[model]
+    count_model.objects.filter(**{f"{fk}_id__in": pks}).delete()
+    counts = Counter()
+    for queryset in shards.per_shard(reaction_model.objects.all(), f"{fk}_id", pks):
+        counts.update(
+            {
+                (row[fk], row["reaction"]): row["count"]
+                for row in queryset.order_by()
+                .values(fk, "reaction")
+                .annotate(count=Count("id"))
+            }
+        )
+    created = count_model.objects.bulk_create(
+        count_model(**{f"{fk}_id": pk}, reaction=reaction, count=count)
+        for (pk, reaction), count in counts.items()
+    )
+    return len(created)
@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import counters, ranking
+from .models import Comment, Reply, Thread
+
+# Threads and comments are soft-deleted together with their whole subtree: one
+# UPDATE per level, all stamped with the same deleted_at. A restore brings back
+# exactly the rows carrying the parent's stamp, so comments and replies that
+# had been deleted on their own before stay deleted.
+
+# Sent with the ``thread_ids`` of threads that were soft-deleted or restored;
+# these go through ``update()``, so no ``post_save`` is sent for them.
+threads_deleted = Signal()
+threads_restored = Signal()
+
+
+def _mark(queryset, deleted_at):
+    return queryset.update(
+        is_deleted=True, deleted_at=deleted_at, updated_at=deleted_at
+    )
+
+
+def _unmark(queryset):
+    return queryset.update(is_deleted=False, deleted_at=None, updated_at=timezone.now())
+
+
+def _parent_stamp(model, field):
+    return Subquery(model.all_objects.filter(pk=OuterRef(field)).values("deleted_at"))
+
+
+def _restore_replies(comment_ids):
+    return _unmark(
+        Reply.all_objects.filter(
+            comment_id__in=comment_ids,
+            is_deleted=True,
+            deleted_at=_parent_stamp(Comment, "comment_id"),
+        )
+    )
+
+
+def _reconcile(thread_ids, comment_ids):
+    counters.reconcile(Comment, comment_ids)
+    counters.reconcile(Thread, thread_ids)
+    ranking.refresh(thread_ids)
+
+
+def delete_threads(thread_ids):
+    """Soft-delete threads with their comments and replies."""
+    thread_ids = list(thread_ids)
+    now = timezone.now()
+    with transaction.atomic():
+        comments = Comment.objects.filter(thread_id__in=thread_ids)
+        _mark(Reply.objects.filter(comment__in=comments), now)
+        _mark(comments, now)
+        deleted = _mark(Thread.objects.filter(id__in=thread_ids), now)
+        cascaded = Comment.all_objects.filter(thread_id__in=thread_ids, deleted_at=now)
+        _reconcile(thread_ids, cascaded.values_list("id", flat=True))
+        threads_deleted.send(sender=Thread, thread_ids=thread_ids)
+    return deleted
+
+
+def restore_threads(thread_ids):
+    """Undo ``delete_threads``; returns the number of threads restored."""
+    thread_ids = list(thread_ids)
+    with transaction.atomic():
+        threads = Thread.all_objects.filter(id__in=thread_ids, is_deleted=True)
+        thread_ids = list(threads.values_list("id", flat=True))
+        comments = Comment.all_objects.filter(
+            thread_id__in=thread_ids,
+            is_deleted=True,
+            deleted_at=_parent_stamp(Thread, "thread_id"),
+        )
+        comment_ids = list(comments.values_list("id", flat=True))
+        _restore_replies(comment_ids)
+        _unmark(Comment.all_objects.filter(id__in=comment_ids))
+        restored = _unmark(Thread.all_objects.filter(id__in=thread_ids))
+        _reconcile(thread_ids, comment_ids)
+        threads_restored.send(sender=Thread, thread_ids=thread_ids)
+    return restored
+
+
+def delete_comments(comment_ids):
+    """Soft-delete comments with their replies."""
+    comment_ids = list(comment_ids)
+    now = timezone.now()
+    with transaction.atomic():
+        comments = Comment.objects.filter(id__in=comment_ids)
+        thread_ids = list(comments.values_list("thread_id", flat=True).distinct())
+        _mark(Reply.objects.filter(comment__in=comments), now)
+        deleted = _mark(comments, now)
+        _reconcile(thread_ids, comment_ids)
+    return deleted
+
+
+def restore_comments(comment_ids):
+    """Undo ``delete_comments``; returns the number of comments restored."""
+    comment_ids = list(comment_ids)
+    with transaction.atomic():
+        # Comments of a thread that is still deleted come back with the thread.
+        comments = Comment.all_objects.filter(
+            id__in=comment_ids, is_deleted=True, thread__is_deleted=False
+        )
+        rows = list(comments.values_list("id", "thread_id"))
+        comment_ids = [comment_id for comment_id, _ in rows]
+        thread_ids = list({thread_id for _, thread_id in rows})
+        _restore_replies(comment_ids)
+        restored = _unmark(Comment.all_objects.filter(id__in=comment_ids))
+        _reconcile(thread_ids, comment_ids)
+    return restored
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from threads import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move soft-deleted threads, comments and replies past the retention "
+        "window, with their reactions, into the archive in throttled batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to pause between batches",
+        )
+        parser.add_argument("--retention-days", type=int, default=None)
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (for time-boxed runs)",
+        )
+
+    def handle(self, *args, **options):
+        batches = 0
+        for model, archive_rows in archive.STAGES:
+            archived = 0
+            while options["max_batches"] is None or batches < options["max_batches"]:
+                ids = archive.expired_ids(
+                    model, options["batch_size"], options["retention_days"]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    archived += archive_rows(ids)
+                batches += 1
+                time.sleep(options["sleep"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Archived {archived} rows under deleted "
+                    f"{model._meta.verbose_name_plural}"
+                )
+            )
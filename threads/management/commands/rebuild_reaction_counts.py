@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from threads import counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-type reaction counts from the reaction tables in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        for model in counters.HISTOGRAMS:
+            pks = model.all_objects.order_by("pk").values_list("pk", flat=True)
+            last_pk = 0
+            rebuilt = 0
+            while True:
+                chunk = list(pks.filter(pk__gt=last_pk)[:chunk_size])
+                if not chunk:
+                    break
+                with transaction.atomic():
+                    rebuilt += counters.rebuild_histograms(model, chunk)
+                last_pk = chunk[-1]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {rebuilt} {model._meta.verbose_name} reaction counts"
+                )
+            )
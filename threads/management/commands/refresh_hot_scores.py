@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from threads import ranking
+from threads.models import Thread
+
+
+class Command(BaseCommand):
+    help = "Recompute explore hot scores in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Only rescore threads created in the last N days",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        pks = Thread.objects.order_by("pk").values_list("pk", flat=True)
+        if options["days"] is not None:
+            since = timezone.now() - timedelta(days=options["days"])
+            pks = pks.filter(created_at__gte=since)
+        last_pk = 0
+        updated = 0
+        while True:
+            chunk = list(pks.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            updated += ranking.refresh(chunk)
+            last_pk = chunk[-1]
+        self.stdout.write(self.style.SUCCESS(f"Rescored {updated} threads"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from threads import deletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore soft-deleted threads or comments together with the comments "
+        "and replies that were deleted with them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, nargs="+", default=[])
+        parser.add_argument("--comments", type=int, nargs="+", default=[])
+
+    def handle(self, *args, **options):
+        threads = deletion.restore_threads(options["threads"])
+        comments = deletion.restore_comments(options["comments"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Restored {threads} threads and {comments} comments")
+        )
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(model, fk, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk: OuterRef("pk")}, **filters)
+            .order_by()
+            .values(fk)
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Thread = apps.get_model("threads", "Thread")
+    Comment = apps.get_model("threads", "Comment")
+    Reply = apps.get_model("threads", "Reply")
+    Thread.objects.update(
+        reactions_count=_count(apps.get_model("threads", "ThreadReactions"), "thread"),
+        comments_count=_count(Comment, "thread", is_deleted=False),
+    )
+    Comment.objects.update(
+        reactions_count=_count(
+            apps.get_model("threads", "CommentReactions"), "comment"
+        ),
+        replies_count=_count(Reply, "comment", is_deleted=False),
+    )
+    Reply.objects.update(
+        reactions_count=_count(apps.get_model("threads", "ReplyReactions"), "reply"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_initial"),
+        ("threads", "0004_alter_commentreactions_reaction_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="reactions_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="replies_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="reply",
+            name="reactions_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="thread",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="thread",
+            name="reactions_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                fields=["-comments_count", "-created_at"],
+                name="threads_thr_comment_e03cbf_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                fields=["-reactions_count", "-created_at"],
+                name="threads_thr_reactio_a6bd8e_idx",
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
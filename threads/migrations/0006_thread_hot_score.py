@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:05
+
+import math
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A copy of threads.ranking.hot_score as it stood when the field was added, with
+# the default weights; `refresh_hot_scores` recomputes scores with the current
+# formula and settings.
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+HOT_SCORE_DECAY_SECONDS = 45000
+
+
+def hot_score(reactions_count, comments_count, created_at):
+    engagement = reactions_count + comments_count
+    age = (created_at - HOT_SCORE_EPOCH).total_seconds()
+    return math.log10(max(engagement, 1)) + age / HOT_SCORE_DECAY_SECONDS
+
+
+def populate_hot_scores(apps, schema_editor):
+    Thread = apps.get_model("threads", "Thread")
+    threads = []
+    for thread in Thread.objects.only(
+        "reactions_count", "comments_count", "created_at"
+    ):
+        thread.hot_score = hot_score(
+            thread.reactions_count, thread.comments_count, thread.created_at
+        )
+        threads.append(thread)
+    Thread.objects.bulk_update(threads, ["hot_score"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_initial"),
+        ("threads", "0005_engagement_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="thread",
+            name="hot_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                fields=["-hot_score", "-created_at"],
+                name="threads_thr_hot_sco_a13145_idx",
+            ),
+        ),
+        migrations.RunPython(populate_hot_scores, migrations.RunPython.noop),
+    ]
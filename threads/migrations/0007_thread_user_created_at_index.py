@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_initial"),
+        ("threads", "0006_thread_hot_score"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                fields=["user", "-created_at"], name="threads_thr_user_id_8e081e_idx"
+            ),
+        ),
+    ]
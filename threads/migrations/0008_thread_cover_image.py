@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def populate_cover_images(apps, schema_editor):
+    Thread = apps.get_model("threads", "Thread")
+    covers = (
+        Thread.images.through.objects.order_by()
+        .values("thread_id")
+        .annotate(image_id=Min("image_id"))
+    )
+    threads = [
+        Thread(id=row["thread_id"], cover_image_id=row["image_id"]) for row in covers
+    ]
+    Thread.objects.bulk_update(threads, ["cover_image"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_initial"),
+        ("threads", "0007_thread_user_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="thread",
+            name="cover_image",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="core.image",
+            ),
+        ),
+        migrations.RunPython(populate_cover_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,166 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_reaction_counts(apps, schema_editor):
+    for name, fk in [("Thread", "thread"), ("Comment", "comment"), ("Reply", "reply")]:
+        Reactions = apps.get_model("threads", f"{name}Reactions")
+        ReactionCount = apps.get_model("threads", f"{name}ReactionCount")
+        rows = (
+            Reactions.objects.order_by()
+            .values(fk, "reaction")
+            .annotate(count=Count("id"))
+        )
+        ReactionCount.objects.bulk_create(
+            (
+                ReactionCount(
+                    **{f"{fk}_id": row[fk]},
+                    reaction=row["reaction"],
+                    count=row["count"],
+                )
+                for row in rows
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("threads", "0008_thread_cover_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommentReactionCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "reaction",
+                    models.CharField(
+                        choices=[
+                            ("like", "Like"),
+                            ("dislike", "Dislike"),
+                            ("love", "Love"),
+                            ("hate", "Hate"),
+                            ("wow", "Wow"),
+                            ("sad", "Sad"),
+                            ("angry", "Angry"),
+                            ("laugh", "Laugh"),
+                            ("none", "None"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "comment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reaction_counts",
+                        to="threads.comment",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("comment", "reaction")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ReplyReactionCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "reaction",
+                    models.CharField(
+                        choices=[
+                            ("like", "Like"),
+                            ("dislike", "Dislike"),
+                            ("love", "Love"),
+                            ("hate", "Hate"),
+                            ("wow", "Wow"),
+                            ("sad", "Sad"),
+                            ("angry", "Angry"),
+                            ("laugh", "Laugh"),
+                            ("none", "None"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "reply",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reaction_counts",
+                        to="threads.reply",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("reply", "reaction")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ThreadReactionCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "reaction",
+                    models.CharField(
+                        choices=[
+                            ("like", "Like"),
+                            ("dislike", "Dislike"),
+                            ("love", "Love"),
+                            ("hate", "Hate"),
+                            ("wow", "Wow"),
+                            ("sad", "Sad"),
+                            ("angry", "Angry"),
+                            ("laugh", "Laugh"),
+                            ("none", "None"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reaction_counts",
+                        to="threads.thread",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("thread", "reaction")},
+            },
+        ),
+        migrations.RunPython(populate_reaction_counts, migrations.RunPython.noop),
+    ]
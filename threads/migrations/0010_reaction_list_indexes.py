@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("threads", "0009_reaction_counts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commentreactions",
+            index=models.Index(
+                fields=["comment", "reaction", "created_at"],
+                name="threads_com_comment_960fe4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="commentreactions",
+            index=models.Index(
+                fields=["comment", "created_at"], name="threads_com_comment_ea551f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="replyreactions",
+            index=models.Index(
+                fields=["reply", "reaction", "created_at"],
+                name="threads_rep_reply_i_c91432_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="replyreactions",
+            index=models.Index(
+                fields=["reply", "created_at"], name="threads_rep_reply_i_dd4536_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="threadreactions",
+            index=models.Index(
+                fields=["thread", "reaction", "created_at"],
+                name="threads_thr_thread__f12f52_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="threadreactions",
+            index=models.Index(
+                fields=["thread", "created_at"], name="threads_thr_thread__be4f54_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_archivedrecord"),
+        ("threads", "0010_reaction_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="threads_thr_comment_e03cbf_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="threads_thr_reactio_a6bd8e_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="threads_thr_hot_sco_a13145_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="threads_thr_user_id_8e081e_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["thread", "created_at"],
+                name="comment_live_thread_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="comment_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reply",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["comment", "created_at"],
+                name="reply_live_comment_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reply",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="reply_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-comments_count", "-created_at"],
+                name="thread_live_comments_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-reactions_count", "-created_at"],
+                name="thread_live_reactions_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-hot_score", "-created_at"],
+                name="thread_live_hot_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "-created_at"],
+                name="thread_live_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="thread_deleted_idx",
+            ),
+        ),
+    ]
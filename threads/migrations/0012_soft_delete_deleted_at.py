@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def populate_deleted_at(apps, schema_editor):
+    # Rows deleted before deleted_at existed were last touched by the delete.
+    for name in ["Thread", "Comment", "Reply"]:
+        model = apps.get_model("threads", name)
+        model.objects.filter(is_deleted=True).update(deleted_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_archivedrecord"),
+        ("threads", "0011_live_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_deleted_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="reply",
+            name="reply_deleted_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="thread_deleted_idx",
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="reply",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="thread",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_deleted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["deleted_at"],
+                name="comment_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reply",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["deleted_at"],
+                name="reply_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["deleted_at"],
+                name="thread_deleted_idx",
+            ),
+        ),
+    ]
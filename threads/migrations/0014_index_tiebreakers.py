@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_archivedrecord"),
+        ("threads", "0013_unenforced_reaction_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reply",
+            name="reply_live_comment_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="thread_live_comments_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="thread_live_reactions_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="thread",
+            name="thread_live_hot_idx",
+        ),
+        migrations.AddIndex(
+            model_name="reply",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["comment", "created_at", "id"],
+                name="reply_live_comment_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-comments_count", "-created_at", "-id"],
+                name="thread_live_comments_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-reactions_count", "-created_at", "-id"],
+                name="thread_live_reactions_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="thread",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-hot_score", "-created_at", "-id"],
+                name="thread_live_hot_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,14 @@
 from django.db import models
 
 from core.models import SoftDelete, Timestamp
+from core.shards import ShardedManager
 from users.models import User
 
+# Hot indexes only cover live rows; soft-deleted rows wait in small
+# DELETED indexes until the archival job moves them out.
+LIVE = models.Q(is_deleted=False)
+DELETED = models.Q(is_deleted=True)
+
 
 class CommentType(models.TextChoices):
     TEXT = "text", "Text"
@@ -26,10 +32,48 @@ class Thread(SoftDelete, Timestamp):
     title = models.CharField(max_length=100)
     content = models.TextField()
     images = models.ManyToManyField("core.Image", blank=True)
+    # First attached image, kept alongside `images` so lists can join it.
+    cover_image = models.ForeignKey(
+        "core.Image",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    reactions_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    hot_score = models.FloatField(default=0)
 
     def __str__(self):
         return self.title
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-comments_count", "-created_at", "-id"],
+                condition=LIVE,
+                name="thread_live_comments_idx",
+            ),
+            models.Index(
+                fields=["-reactions_count", "-created_at", "-id"],
+                condition=LIVE,
+                name="thread_live_reactions_idx",
+            ),
+            models.Index(
+                fields=["-hot_score", "-created_at", "-id"],
+                condition=LIVE,
+                name="thread_live_hot_idx",
+            ),
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=LIVE,
+                name="thread_live_user_idx",
+            ),
+            models.Index(
+                fields=["deleted_at"], condition=DELETED, name="thread_deleted_idx"
+            ),
+        ]
+
 
 class Comment(SoftDelete, Timestamp):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -39,10 +83,24 @@ class Comment(SoftDelete, Timestamp):
     )
     content = models.TextField()
     images = models.ForeignKey("core.Image", on_delete=models.SET_NULL, null=True)
+    reactions_count = models.PositiveIntegerField(default=0)
+    replies_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.content
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["thread", "created_at"],
+                condition=LIVE,
+                name="comment_live_thread_idx",
+            ),
+            models.Index(
+                fields=["deleted_at"], condition=DELETED, name="comment_deleted_idx"
+            ),
+        ]
+
 
 class Reply(SoftDelete, Timestamp):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -52,11 +110,27 @@ class Reply(SoftDelete, Timestamp):
     content = models.TextField()
     comment_type = models.CharField(max_length=10, choices=CommentType.choices)
     images = models.ForeignKey("core.Image", on_delete=models.SET_NULL, null=True)
+    reactions_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.content
 
-
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["comment", "created_at", "id"],
+                condition=LIVE,
+                name="reply_live_comment_idx",
+            ),
+            models.Index(
+                fields=["deleted_at"], condition=DELETED, name="reply_deleted_idx"
+            ),
+        ]
+
+
+# Reactions can live in shard databases (see core.shards), apart from the
+# threads, comments, replies and users they point to; shards leave their
+# foreign keys unenforced (see core.signals).
 class ThreadReactions(Timestamp):
     thread = models.ForeignKey(
         Thread, on_delete=models.CASCADE, related_name="reactions"
@@ -64,11 +138,18 @@ class ThreadReactions(Timestamp):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     reaction = models.CharField(max_length=10, choices=Reactions.choices)
 
+    objects = ShardedManager()
+    shard_key = "thread"
+
     def __str__(self):
         return f"{self.user} {self.reaction} {self.thread}"
 
     class Meta:
         unique_together = ("thread", "user")
+        indexes = [
+            models.Index(fields=["thread", "reaction", "created_at"]),
+            models.Index(fields=["thread", "created_at"]),
+        ]
 
 
 class CommentReactions(Timestamp):
@@ -78,11 +159,18 @@ class CommentReactions(Timestamp):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     reaction = models.CharField(max_length=10, choices=Reactions.choices)
 
+    objects = ShardedManager()
+    shard_key = "comment"
+
     def __str__(self):
         return f"{self.user} {self.reaction} {self.comment}"
 
     class Meta:
         unique_together = ("comment", "user")
+        indexes = [
+            models.Index(fields=["comment", "reaction", "created_at"]),
+            models.Index(fields=["comment", "created_at"]),
+        ]
 
 
 class ReplyReactions(Timestamp):
@@ -90,8 +178,57 @@ class ReplyReactions(Timestamp):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     reaction = models.CharField(max_length=10, choices=Reactions.choices)
 
+    objects = ShardedManager()
+    shard_key = "reply"
+
     def __str__(self):
         return f"{self.user} {self.reaction} {self.reply}"
 
     class Meta:
         unique_together = ("reply", "user")
+        indexes = [
+            models.Index(fields=["reply", "reaction", "created_at"]),
+            models.Index(fields=["reply", "created_at"]),
+        ]
+
+
+class ThreadReactionCount(models.Model):
+    thread = models.ForeignKey(
+        Thread, on_delete=models.CASCADE, related_name="reaction_counts"
+    )
+    reaction = models.CharField(max_length=10, choices=Reactions.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.thread} {self.reaction} {self.count}"
+
+    class Meta:
+        unique_together = ("thread", "reaction")
+
+
+class CommentReactionCount(models.Model):
+    comment = models.ForeignKey(
+        Comment, on_delete=models.CASCADE, related_name="reaction_counts"
+    )
+    reaction = models.CharField(max_length=10, choices=Reactions.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.comment} {self.reaction} {self.count}"
+
+    class Meta:
+        unique_together = ("comment", "reaction")
+
+
+class ReplyReactionCount(models.Model):
+    reply = models.ForeignKey(
+        Reply, on_delete=models.CASCADE, related_name="reaction_counts"
+    )
+    reaction = models.CharField(max_length=10, choices=Reactions.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.reply} {self.reaction} {self.count}"
+
+    class Meta:
+        unique_together = ("reply", "reaction")
@@ -0,0 +1,37 @@
+import math
+from datetime import UTC, datetime
+
+from django.conf import settings
+
+from .models import Thread
+
+# Scores are log10(engagement) plus the thread's age in units of
+# HOT_SCORE_DECAY_SECONDS, so a thread needs 10x the engagement of one posted
+# DECAY_SECONDS later to rank alongside it. Because the time term only depends
+# on created_at, a score can be updated on its own whenever engagement changes.
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+HOT_SCORE_DECAY_SECONDS = getattr(settings, "HOT_SCORE_DECAY_SECONDS", 45000)
+HOT_SCORE_REACTION_WEIGHT = getattr(settings, "HOT_SCORE_REACTION_WEIGHT", 1)
+HOT_SCORE_COMMENT_WEIGHT = getattr(settings, "HOT_SCORE_COMMENT_WEIGHT", 1)
+
+
+def hot_score(reactions_count, comments_count, created_at):
+    engagement = (
+        reactions_count * HOT_SCORE_REACTION_WEIGHT
+        + comments_count * HOT_SCORE_COMMENT_WEIGHT
+    )
+    age = (created_at - HOT_SCORE_EPOCH).total_seconds()
+    return math.log10(max(engagement, 1)) + age / HOT_SCORE_DECAY_SECONDS
+
+
+def refresh(thread_ids):
+    """Recompute and store the hot score for a batch of threads."""
+    rows = Thread.all_objects.filter(id__in=thread_ids).values_list(
+        "id", "reactions_count", "comments_count", "created_at"
+    )
+    threads = [
+        Thread(id=thread_id, hot_score=hot_score(reactions, comments, created_at))
+        for thread_id, reactions, comments, created_at in rows
+    ]
+    Thread.all_objects.bulk_update(threads, ["hot_score"])
+    return len(threads)
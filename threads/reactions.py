@@ -0,0 +1,153 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from core import shards
+
+from . import counters, ranking
+from .models import (
+    Comment,
+    CommentReactions,
+    Reply,
+    ReplyReactions,
+    Thread,
+    ThreadReactions,
+)
+
+logger = logging.getLogger(__name__)
+
+# Reactions are stored as they come in; the counters of the objects they touch
+# are recomputed in batches once this many objects are pending, or this many
+# seconds after the first one came in.
+REACTION_BUFFER_SIZE = getattr(settings, "REACTION_BUFFER_SIZE", 500)
+REACTION_BUFFER_INTERVAL = getattr(settings, "REACTION_BUFFER_INTERVAL", 1)
+
+# kind -> (reaction model, foreign key to the reacted object, reacted model)
+KINDS = {
+    "thread": (ThreadReactions, "thread", Thread),
+    "comment": (CommentReactions, "comment", Comment),
+    "reply": (ReplyReactions, "reply", Reply),
+}
+
+
+class ReactionBuffer:
+    """Stores reactions and recounts the objects they touched in batches.
+
+    Counters are recomputed from the stored rows, so flushes racing in several
+    workers cannot count a reaction twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = defaultdict(set)
+        self._started_at = None
+        self._timer = None
+
+    def add(self, kind, object_id, user_id, reaction):
+        model, fk, _ = KINDS[kind]
+        model.objects.bulk_create(
+            [
+                model(
+                    **{f"{fk}_id": object_id, "user_id": user_id, "reaction": reaction}
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=[fk, "user"],
+            update_fields=["reaction", "updated_at"],
+        )
+        with self._lock:
+            self._pending[kind].add(object_id)
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            full = sum(map(len, self._pending.values())) >= REACTION_BUFFER_SIZE
+            due = time.monotonic() - self._started_at >= REACTION_BUFFER_INTERVAL
+            if not full and not due:
+                self._schedule()
+        if full or due:
+            self.flush()
+
+    def _schedule(self):
+        """Start the timer flushing the pending objects; holds ``_lock``."""
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        if self._timer is None:
+            self._timer = threading.Timer(
+                REACTION_BUFFER_INTERVAL, self._flush_in_background
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = defaultdict(set)
+                self._started_at = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return 0
+            try:
+                with transaction.atomic():
+                    for kind, object_ids in batch.items():
+                        recount(kind, sorted(object_ids))
+            except Exception:
+                logger.exception(
+                    "Recounting reactions of %d objects failed, retrying",
+                    sum(map(len, batch.values())),
+                )
+                with self._lock:
+                    for kind, object_ids in batch.items():
+                        self._pending[kind].update(object_ids)
+                    self._schedule()
+                return 0
+            return sum(map(len, batch.values()))
+
+
+def recount(kind, object_ids):
+    """Recompute the reaction counters of objects from their reactions."""
+    _, _, target = KINDS[kind]
+    counters.reconcile(target, object_ids)
+    counters.rebuild_histograms(target, object_ids)
+    if target is Thread:
+        ranking.refresh(object_ids)
+
+
+buffer = ReactionBuffer()
+atexit.register(buffer.flush)
+
+
+def summaries(kind, object_ids, user_id=None):
+    """Reaction counts and the user's own reaction for many objects of a kind.
+
+    Returns ``{object_id: {"reaction_counts": [...], "my_reaction": ...}}``
+    from one query for the counts and one per shard for the user's reactions.
+    """
+    model, fk, target = KINDS[kind]
+    histograms = counters.reaction_histograms(target, object_ids)
+    mine = {}
+    if user_id is not None and object_ids:
+        for queryset in shards.per_shard(
+            model.objects.filter(user_id=user_id), f"{fk}_id", object_ids
+        ):
+            mine.update(queryset.values_list(f"{fk}_id", "reaction"))
+    return {
+        object_id: {
+            "reaction_counts": histograms[object_id],
+            "my_reaction": mine.get(object_id),
+        }
+        for object_id in object_ids
+    }
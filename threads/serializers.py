@@ -1,8 +1,13 @@
+from operator import attrgetter
+
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 
+from core.compiled import CompiledSerializer
 from core.models import Image
-from core.serializers import ImageSerializer
-from users.serializers import UserListSerializer
+from core.serializers import BulkManyRelatedField, ImageSerializer
+from users.cards import cards
+from users.serializers import UserCardField
 
 from .models import (
     Comment,
@@ -17,33 +22,56 @@ from .models import (
 
 
 class ThreadSerializer(serializers.ModelSerializer):
-    images = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=Image.objects.all(), required=False
+    images = BulkManyRelatedField(
+        child_relation=serializers.PrimaryKeyRelatedField(queryset=Image.objects.all()),
+        required=False,
     )
 
     class Meta:
         model = Thread
-        fields = "__all__"
-        extra_kwargs = {
-            "user": {"read_only": True},
-        }
+        fields = [
+            "id",
+            "images",
+            "created_at",
+            "updated_at",
+            "is_deleted",
+            "title",
+            "content",
+            "reactions_count",
+            "comments_count",
+            "user",
+        ]
+        read_only_fields = ["is_deleted", "reactions_count", "comments_count", "user"]
 
     def to_representation(self, instance):
+        # Both the ids and the embedded images read the prefetched rows.
+        prefetch_related_objects([instance], "images")
         representation = super().to_representation(instance)
         representation["images"] = ImageSerializer(
             instance.images.all(), many=True
         ).data
-        representation["user"] = UserListSerializer(instance.user).data
+        representation["user"] = cards.get(instance.user_id)
         return representation
 
+    def create(self, validated_data):
+        validated_data["cover_image"] = cover_image(validated_data.get("images"))
+        return super().create(validated_data)
+
     def update(self, instance, validated_data):
         images = validated_data.pop("images", None)
+        if images:
+            validated_data["cover_image"] = cover_image(images)
         instance = super().update(instance, validated_data)
         if images:
             instance.images.set(images)
         return instance
 
 
+def cover_image(images):
+    """The image a thread with ``images`` shows in lists: its first one."""
+    return min(images, key=attrgetter("pk")) if images else None
+
+
 class ThreadListSerializer(serializers.ModelSerializer):
     cover_image = serializers.PrimaryKeyRelatedField(
         queryset=Image.objects.all(), required=False
@@ -55,7 +83,7 @@ class ThreadListSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation["cover_image"] = ImageSerializer(instance.images.first()).data
+        representation["cover_image"] = ImageSerializer(instance.cover_image).data
         return representation
 
 
@@ -67,8 +95,27 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = "__all__"
-        read_only_fields = ["user", "thread"]
+        fields = [
+            "id",
+            "content",
+            "image",
+            "created_at",
+            "updated_at",
+            "is_deleted",
+            "comment_type",
+            "reactions_count",
+            "replies_count",
+            "user",
+            "thread",
+            "images",
+        ]
+        read_only_fields = [
+            "is_deleted",
+            "reactions_count",
+            "replies_count",
+            "user",
+            "thread",
+        ]
 
     def validate(self, attrs):
         type = attrs.get("comment_type")
@@ -101,8 +148,20 @@ class ReplySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Reply
-        fields = "__all__"
-        read_only_fields = ["user", "comment"]
+        fields = [
+            "id",
+            "content",
+            "image",
+            "created_at",
+            "updated_at",
+            "is_deleted",
+            "comment_type",
+            "reactions_count",
+            "user",
+            "comment",
+            "images",
+        ]
+        read_only_fields = ["is_deleted", "reactions_count", "user", "comment"]
 
     def validate(self, attrs):
         type = attrs.get("comment_type")
@@ -124,33 +183,36 @@ class ReactionSerializer(serializers.Serializer):
 
 
 class ThreadReactionsSerializer(serializers.ModelSerializer):
+    user = UserCardField()
+
     class Meta:
         model = ThreadReactions
         fields = ["reaction", "thread", "user"]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["user"] = UserListSerializer(instance.user).data
-        return representation
-
 
 class CommentReactionsSerializer(serializers.ModelSerializer):
+    user = UserCardField()
+
     class Meta:
         model = CommentReactions
         fields = ["reaction", "comment", "user"]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["user"] = UserListSerializer(instance.user).data
-        return representation
-
 
 class ReplyReactionsSerializer(serializers.ModelSerializer):
+    user = UserCardField()
+
     class Meta:
         model = ReplyReactions
         fields = ["reaction", "reply", "user"]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["user"] = UserListSerializer(instance.user).data
-        return representation
+
+class CompiledThreadReactionsSerializer(CompiledSerializer):
+    serializer_class = ThreadReactionsSerializer
+
+
+class CompiledCommentReactionsSerializer(CompiledSerializer):
+    serializer_class = CommentReactionsSerializer
+
+
+class CompiledReplyReactionsSerializer(CompiledSerializer):
+    serializer_class = ReplyReactionsSerializer
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import ArchivedRecord, Image
+from threads import deletion
+from threads.models import Comment, Reply, Thread, ThreadReactions
+from users.models import User
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        self.image = Image.objects.create(image="images/test.png", created_by=self.user)
+
+    def deleted_thread(self, days_ago):
+        thread = Thread.objects.create(user=self.user, title="t", content="c")
+        thread.images.add(self.image)
+        comment = Comment.objects.create(
+            thread=thread, user=self.user, content="c", comment_type="text"
+        )
+        Reply.objects.create(
+            comment=comment, user=self.user, content="r", comment_type="text"
+        )
+        ThreadReactions.objects.create(thread=thread, user=self.user, reaction="like")
+        deletion.delete_threads([thread.id])
+        stamp = timezone.now() - timedelta(days=days_ago)
+        for model in (Thread, Comment, Reply):
+            model.all_objects.filter(is_deleted=True).update(deleted_at=stamp)
+        return thread
+
+    def archive(self):
+        call_command("archive_deleted", "--sleep=0", stdout=StringIO())
+
+    def test_expired_threads_move_to_the_archive_with_their_subtree(self):
+        expired = self.deleted_thread(days_ago=40)
+
+        self.archive()
+
+        self.assertFalse(Thread.all_objects.filter(pk=expired.pk).exists())
+        self.assertFalse(Comment.all_objects.exists())
+        self.assertFalse(Reply.all_objects.exists())
+        self.assertFalse(ThreadReactions.objects.exists())
+        self.assertEqual(
+            sorted(ArchivedRecord.objects.values_list("model", flat=True)),
+            [
+                "threads.comment",
+                "threads.reply",
+                "threads.thread",
+                "threads.threadreactions",
+            ],
+        )
+        record = ArchivedRecord.objects.get(model="threads.thread")
+        self.assertEqual(record.object_id, expired.pk)
+        self.assertEqual(record.data["images"], [self.image.pk])
+
+    def test_recent_deletions_are_kept(self):
+        recent = self.deleted_thread(days_ago=1)
+
+        self.archive()
+
+        self.assertTrue(Thread.all_objects.filter(pk=recent.pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from threads import counters
+from threads.models import Comment, Reply, Thread, ThreadReactions
+from users.models import User
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/threads/threads/{self.thread.id}/comments/"
+
+    def test_comments_adjust_the_thread_count(self):
+        response = self.client.post(
+            self.url, {"content": "c", "comment_type": "text"}, format="json"
+        )
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 1)
+
+        self.client.delete(f"{self.url}{response.json()['id']}/")
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 0)
+
+    def test_adjust_never_goes_below_zero(self):
+        counters.adjust(Thread, self.thread.pk, comments_count=-3)
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 0)
+
+    def test_counters_are_read_only(self):
+        self.client.patch(
+            f"/api/threads/threads/{self.thread.id}/",
+            {"comments_count": 7, "reactions_count": 7},
+            format="json",
+        )
+
+        self.thread.refresh_from_db()
+        self.assertEqual(
+            (self.thread.comments_count, self.thread.reactions_count), (0, 0)
+        )
+
+    def test_reconcile_counters_recounts_drifted_rows(self):
+        comment = Comment.objects.create(
+            thread=self.thread, user=self.user, content="c", comment_type="text"
+        )
+        Reply.objects.create(
+            comment=comment, user=self.user, content="r", comment_type="text"
+        )
+        ThreadReactions.objects.create(
+            thread=self.thread, user=self.user, reaction="like"
+        )
+        Thread.objects.update(comments_count=5, reactions_count=5)
+
+        call_command("reconcile_counters", stdout=StringIO())
+
+        self.thread.refresh_from_db()
+        comment.refresh_from_db()
+        self.assertEqual(
+            (self.thread.comments_count, self.thread.reactions_count), (1, 1)
+        )
+        self.assertEqual(comment.replies_count, 1)
@@ -0,0 +1,58 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Image
+from threads.models import Thread
+from users.models import User
+
+
+class CoverImageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        self.first, self.second = (
+            Image.objects.create(image=f"images/{name}.png", created_by=self.user)
+            for name in ("first", "second")
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, images):
+        response = self.client.post(
+            "/api/threads/threads/",
+            {"title": "t", "content": "c", "images": images},
+            format="json",
+        )
+        return Thread.objects.get(pk=response.json()["id"])
+
+    def listed(self):
+        response = self.client.get("/api/threads/threads/")
+        if response.streaming:
+            return json.loads(b"".join(response.streaming_content))
+        return response.json()
+
+    def test_first_image_becomes_the_cover(self):
+        thread = self.create([self.second.id, self.first.id])
+
+        self.assertEqual(thread.cover_image, self.first)
+        self.assertEqual(self.listed()[0]["cover_image"]["id"], self.first.id)
+
+    def test_threads_without_images_have_no_cover(self):
+        thread = self.create([])
+
+        self.assertIsNone(thread.cover_image)
+
+    def test_replacing_the_images_moves_the_cover(self):
+        thread = self.create([self.first.id])
+
+        self.client.patch(
+            f"/api/threads/threads/{thread.id}/",
+            {"images": [self.second.id]},
+            format="json",
+        )
+
+        thread.refresh_from_db()
+        self.assertEqual(thread.cover_image, self.second)
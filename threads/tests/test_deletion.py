@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from threads import deletion
+from threads.models import Comment, Reply, Thread
+from users.models import User
+
+
+class CascadingDeletionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+        self.kept, self.removed = (
+            Comment.objects.create(
+                thread=self.thread, user=self.user, content="c", comment_type="text"
+            )
+            for _ in range(2)
+        )
+        self.reply = Reply.objects.create(
+            comment=self.kept, user=self.user, content="r", comment_type="text"
+        )
+        Thread.objects.filter(pk=self.thread.pk).update(comments_count=2)
+
+    def alive(self, model):
+        return set(model.objects.values_list("id", flat=True))
+
+    def test_thread_deletion_takes_its_subtree(self):
+        deletion.delete_threads([self.thread.id])
+
+        self.assertEqual(self.alive(Thread), set())
+        self.assertEqual(self.alive(Comment), set())
+        self.assertEqual(self.alive(Reply), set())
+        self.assertEqual(
+            len(
+                {
+                    *Comment.all_objects.values_list("deleted_at", flat=True),
+                    *Reply.all_objects.values_list("deleted_at", flat=True),
+                    Thread.all_objects.get().deleted_at,
+                }
+            ),
+            1,
+        )
+
+    def test_restore_skips_rows_deleted_on_their_own(self):
+        deletion.delete_comments([self.removed.id])
+        deletion.delete_threads([self.thread.id])
+
+        call_command(
+            "restore_deleted", "--threads", str(self.thread.id), stdout=StringIO()
+        )
+
+        self.assertEqual(self.alive(Thread), {self.thread.id})
+        self.assertEqual(self.alive(Comment), {self.kept.id})
+        self.assertEqual(self.alive(Reply), {self.reply.id})
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 1)
+
+    def test_comments_of_deleted_threads_come_back_with_the_thread(self):
+        deletion.delete_threads([self.thread.id])
+
+        self.assertEqual(deletion.restore_comments([self.kept.id]), 0)
+        self.assertEqual(self.alive(Comment), set())
+
+    def test_comment_deletion_updates_the_counters(self):
+        deletion.delete_comments([self.kept.id])
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 1)
+        self.assertEqual(self.alive(Reply), set())
+
+        deletion.restore_comments([self.kept.id])
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.comments_count, 2)
+        self.assertEqual(self.alive(Reply), {self.reply.id})
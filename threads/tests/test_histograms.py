@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from threads import counters
+from threads.models import Thread, ThreadReactionCount, ThreadReactions
+from users.models import User
+
+
+class ReactionHistogramTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create(username=f"user-{index}") for index in range(3)
+        ]
+        self.thread = Thread.objects.create(user=self.users[0], title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def react(self, *reactions):
+        ThreadReactions.objects.bulk_create(
+            ThreadReactions(thread=self.thread, user=user, reaction=reaction)
+            for user, reaction in zip(self.users, reactions)
+        )
+
+    def histogram(self):
+        url = f"/api/threads/threads/{self.thread.id}/reactions-count/"
+        return self.client.get(url).json()
+
+    def test_rebuild_reaction_counts_recounts_from_the_reactions(self):
+        self.react("like", "love", "like")
+        ThreadReactionCount.objects.create(thread=self.thread, reaction="sad", count=4)
+
+        call_command("rebuild_reaction_counts", "--chunk-size=1", stdout=StringIO())
+
+        self.assertEqual(
+            self.histogram(),
+            [{"reaction": "like", "count": 2}, {"reaction": "love", "count": 1}],
+        )
+
+    def test_adjustments_floor_at_zero_and_hide_empty_counts(self):
+        counters.adjust_histograms(
+            Thread, {(self.thread.pk, "like"): 2, (self.thread.pk, "wow"): 1}
+        )
+        counters.adjust_histograms(
+            Thread, {(self.thread.pk, "like"): -1, (self.thread.pk, "wow"): -5}
+        )
+
+        self.assertEqual(self.histogram(), [{"reaction": "like", "count": 1}])
+        self.assertEqual(ThreadReactionCount.objects.get(reaction="wow").count, 0)
@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Image
+from core.queries import QueryRecorder, enforce_query_budgets
+from threads import reactions
+from threads.models import Comment, Reply, Thread, ThreadReactions
+from users.cards import cards
+from users.graph import graph
+from users.models import Followers, User
+
+
+@mock.patch.object(reactions, "REACTION_BUFFER_INTERVAL", 60)
+class QueryBudgetTests(TestCase):
+    """Every action stays within its budget, and costs as many queries with a
+    little data as with more of it."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(self.drop_buffered_reactions)
+        self.user = User.objects.create(username="reader")
+        self.author = User.objects.create(username="author")
+        Followers.objects.create(follower=self.user, following=self.author)
+        self.image = Image.objects.create(image="images/test.png", created_by=self.user)
+        self.thread = Thread.objects.create(user=self.author, title="t", content="c")
+        self.thread.images.add(self.image)
+        self.comment = Comment.objects.create(
+            thread=self.thread, user=self.author, content="c", comment_type="text"
+        )
+        Reply.objects.create(
+            comment=self.comment, user=self.author, content="r", comment_type="text"
+        )
+        ThreadReactions.objects.create(
+            thread=self.thread, user=self.author, reaction="like"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def drop_buffered_reactions(self):
+        buffer = reactions.buffer
+        with buffer._lock:
+            if buffer._timer is not None:
+                buffer._timer.cancel()
+                buffer._timer = None
+            buffer._pending.clear()
+            buffer._started_at = None
+
+    def grow(self, rows=20):
+        """Add ``rows`` of everything the requests list, count or fan out to."""
+        for index in range(rows):
+            other = User.objects.create(username=f"other-{index}")
+            Followers.objects.create(follower=self.user, following=other)
+            Followers.objects.create(follower=other, following=self.user)
+            Followers.objects.create(follower=other, following=self.author)
+            thread = Thread.objects.create(user=other, title="t", content="c")
+            thread.images.add(self.image)
+            Thread.objects.create(user=self.author, title="t", content="c")
+            comment = Comment.objects.create(
+                thread=self.thread, user=other, content="c", comment_type="text"
+            )
+            Reply.objects.create(
+                comment=self.comment, user=other, content="r", comment_type="text"
+            )
+            ThreadReactions.objects.create(
+                thread=self.thread, user=other, reaction="like"
+            )
+            Reply.objects.create(
+                comment=comment, user=other, content="r", comment_type="text"
+            )
+
+    def queries(self, method, url, data=None):
+        """Queries run by one request, failing it when it goes over budget."""
+        # Cached pages and cards would hide the queries of the request. The
+        # follow graph reads every follow once per process, not per request.
+        cache.clear()
+        cards.reset()
+        graph.following_ids(self.user)
+        with QueryRecorder() as recorder, enforce_query_budgets():
+            response = getattr(self.client, method)(url, data, format="json")
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 300, f"{method} {url}")
+        return recorder.count()
+
+    def assertConstantQueries(self, requests):
+        """Run ``requests()`` before and after growing the data."""
+        small = [self.queries(*request) for request in requests()]
+        self.grow()
+        large = [self.queries(*request) for request in requests()]
+        self.assertEqual(small, large)
+
+    def test_list_actions(self):
+        thread, comment = self.thread.id, self.comment.id
+        self.assertConstantQueries(
+            lambda: [
+                ("get", "/api/threads/threads/"),
+                ("get", f"/api/threads/threads/{thread}/comments/"),
+                ("get", f"/api/threads/threads/{thread}/comments/{comment}/replies/"),
+                ("get", f"/api/threads/threads/{thread}/reactions/"),
+                ("get", "/api/feeds/feeds/"),
+                ("get", "/api/feeds/feeds/?sort=comments"),
+                ("get", "/api/feeds/explore/"),
+                ("get", "/api/users/follow/"),
+            ]
+        )
+
+    def test_detail_actions(self):
+        thread, comment = self.thread.id, self.comment.id
+        self.assertConstantQueries(
+            lambda: [
+                ("get", f"/api/threads/threads/{thread}/"),
+                ("get", f"/api/threads/threads/{thread}/view/"),
+                ("get", f"/api/threads/threads/{thread}/reactions-count/"),
+                ("get", f"/api/threads/threads/{thread}/comments/{comment}/"),
+                ("get", f"/api/users/users/{self.author.id}/"),
+            ]
+        )
+
+    def test_write_actions(self):
+        def requests():
+            thread = Thread.objects.create(user=self.user, title="t", content="c")
+            url = f"/api/threads/threads/{thread.id}/"
+            return [
+                ("post", "/api/threads/threads/", {"title": "t", "content": "c"}),
+                ("patch", url, {"title": "edited"}),
+                ("post", f"{url}react/", {"reaction": "like"}),
+                (
+                    "post",
+                    f"{url}comments/",
+                    {"content": "c", "comment_type": "text"},
+                ),
+                ("delete", url),
+            ]
+
+        self.assertConstantQueries(requests)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from threads import ranking
+from threads.models import Thread
+from users.models import User
+
+
+class HotScoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+
+    def thread(self, title, age=timedelta(0), **counts):
+        thread = Thread.objects.create(user=self.user, title=title, content="c")
+        Thread.objects.filter(pk=thread.pk).update(
+            created_at=timezone.now() - age, **counts
+        )
+        return thread
+
+    def test_score_grows_with_engagement_and_recency(self):
+        now = timezone.now()
+
+        self.assertGreater(ranking.hot_score(10, 0, now), ranking.hot_score(1, 0, now))
+        self.assertGreater(
+            ranking.hot_score(1, 0, now),
+            ranking.hot_score(1, 0, now - timedelta(days=1)),
+        )
+
+    def test_ten_times_the_engagement_makes_up_for_one_decay_period(self):
+        now = timezone.now()
+        earlier = now - timedelta(seconds=ranking.HOT_SCORE_DECAY_SECONDS)
+
+        self.assertAlmostEqual(
+            ranking.hot_score(100, 0, earlier), ranking.hot_score(10, 0, now)
+        )
+
+    def test_explore_orders_by_refreshed_scores(self):
+        old = self.thread("old", age=timedelta(days=3), reactions_count=50)
+        quiet = self.thread("quiet")
+        busy = self.thread("busy", reactions_count=20, comments_count=5)
+
+        call_command("refresh_hot_scores", stdout=StringIO())
+        response = APIClient().get("/api/feeds/explore/")
+
+        self.assertEqual(
+            [thread["id"] for thread in response.json()["results"]],
+            [busy.id, quiet.id, old.id],
+        )
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from threads.models import Thread, ThreadReactions
+from threads.views import ReactionPagination
+from users.graph import graph
+from users.models import Followers, User
+
+
+class ReactionListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        graph.reset()
+        self.reader = User.objects.create(username="reader")
+        self.users = [User.objects.create(username=name) for name in "abcde"]
+        self.thread = Thread.objects.create(user=self.reader, title="t", content="c")
+        now = timezone.now()
+        for age, (user, reaction) in enumerate(
+            zip(reversed(self.users), ["like", "love", "like", "like", "like"])
+        ):
+            ThreadReactions.objects.filter(
+                pk=ThreadReactions.objects.create(
+                    thread=self.thread, user=user, reaction=reaction
+                ).pk
+            ).update(created_at=now - timedelta(minutes=age))
+        for name in "bd":
+            Followers.objects.create(
+                follower=self.reader, following=User.objects.get(username=name)
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def walk(self, **params):
+        url = f"/api/threads/threads/{self.thread.id}/reactions/"
+        names = []
+        while url:
+            body = self.client.get(url, params).json()
+            names += [reaction["user"]["username"] for reaction in body["results"]]
+            url, params = body["next"], None
+        return "".join(names)
+
+    def test_newest_reactions_come_first(self):
+        self.assertEqual(self.walk(), "edcba")
+
+    def test_reaction_filter(self):
+        self.assertEqual(self.walk(reaction="like"), "ecba")
+
+    @mock.patch.object(ReactionPagination, "page_size", 2)
+    def test_followed_users_come_first_across_pages(self):
+        self.assertEqual(self.walk(following_first=1), "dbeca")
+        self.assertEqual(self.walk(following_first=1, reaction="like"), "beca")
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from threads import counters, views
+from threads.models import Comment, CommentReactions, Thread, ThreadReactions
+from users.models import User
+
+URL = "/api/threads/reactions/"
+
+
+class ReactionSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        other = User.objects.create(username="other")
+        self.threads = [
+            Thread.objects.create(user=self.user, title=str(index), content="c")
+            for index in range(2)
+        ]
+        self.comment = Comment.objects.create(
+            thread=self.threads[0], user=self.user, content="c", comment_type="text"
+        )
+        ThreadReactions.objects.create(
+            thread=self.threads[0], user=self.user, reaction="love"
+        )
+        ThreadReactions.objects.create(
+            thread=self.threads[0], user=other, reaction="love"
+        )
+        CommentReactions.objects.create(
+            comment=self.comment, user=other, reaction="sad"
+        )
+        counters.rebuild_histograms(Thread, [thread.pk for thread in self.threads])
+        counters.rebuild_histograms(Comment, [self.comment.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_counts_and_own_reaction_per_kind(self):
+        first, second = self.threads
+        response = self.client.get(
+            URL, {"thread": f"{first.id},{second.id}", "comment": str(self.comment.id)}
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "thread": {
+                    str(first.id): {
+                        "reaction_counts": [{"reaction": "love", "count": 2}],
+                        "my_reaction": "love",
+                    },
+                    str(second.id): {"reaction_counts": [], "my_reaction": None},
+                },
+                "comment": {
+                    str(self.comment.id): {
+                        "reaction_counts": [{"reaction": "sad", "count": 1}],
+                        "my_reaction": None,
+                    }
+                },
+            },
+        )
+
+    def test_kinds_without_ids_are_left_out(self):
+        self.assertEqual(self.client.get(URL).json(), {})
+
+    def test_bad_ids_are_rejected(self):
+        self.assertEqual(self.client.get(URL, {"thread": "1,x"}).status_code, 400)
+
+    @mock.patch.object(views, "REACTION_SUMMARY_MAX_IDS", 1)
+    def test_too_many_ids_are_rejected(self):
+        self.assertEqual(self.client.get(URL, {"reply": "1,2"}).status_code, 400)
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from threads import counters, deletion, reactions
+from threads.models import Thread, ThreadReactions
+from users.models import User
+
+
+@mock.patch.object(reactions, "REACTION_BUFFER_INTERVAL", 60)
+class ReactionBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.buffer = self.worker()
+        self.user = User.objects.create(username="reader")
+        self.other = User.objects.create(username="other")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+
+    def worker(self):
+        """A buffer as a separate worker process would have it."""
+        buffer = reactions.ReactionBuffer()
+        self.addCleanup(lambda: buffer._timer and buffer._timer.cancel())
+        return buffer
+
+    def assertCounted(self, reactions_count, histogram):
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.reactions_count, reactions_count)
+        self.assertEqual(counters.reaction_histogram(Thread, self.thread.id), histogram)
+
+    def test_reactions_are_stored_before_the_flush(self):
+        self.buffer.add("thread", self.thread.id, self.user.id, "like")
+        self.buffer.add("thread", self.thread.id, self.user.id, "love")
+
+        self.assertEqual(
+            list(ThreadReactions.objects.values_list("user_id", "reaction")),
+            [(self.user.id, "love")],
+        )
+        self.assertCounted(0, [])
+
+    def test_flush_recounts_the_touched_objects(self):
+        self.buffer.add("thread", self.thread.id, self.user.id, "like")
+        self.buffer.add("thread", self.thread.id, self.other.id, "love")
+
+        self.assertEqual(self.buffer.flush(), 1)
+
+        self.assertCounted(
+            2, [{"reaction": "like", "count": 1}, {"reaction": "love", "count": 1}]
+        )
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_flushes_from_two_workers_count_each_reaction_once(self):
+        first, second = self.buffer, self.worker()
+        first.add("thread", self.thread.id, self.user.id, "like")
+        second.add("thread", self.thread.id, self.other.id, "like")
+        second.add("thread", self.thread.id, self.user.id, "love")
+
+        first.flush()
+        second.flush()
+        first.add("thread", self.thread.id, self.other.id, "love")
+        first.flush()
+        second.flush()
+
+        self.assertCounted(2, [{"reaction": "love", "count": 2}])
+
+    def test_failed_flush_keeps_the_objects_for_the_next_one(self):
+        self.buffer.add("thread", self.thread.id, self.user.id, "like")
+
+        with (
+            mock.patch.object(
+                reactions, "recount", side_effect=OperationalError("locked")
+            ),
+            self.assertLogs("threads.reactions", "ERROR"),
+        ):
+            self.assertEqual(self.buffer.flush(), 0)
+
+        self.assertIsNotNone(self.buffer._timer)
+        self.assertCounted(0, [])
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertCounted(1, [{"reaction": "like", "count": 1}])
+
+    def test_reactions_to_deleted_objects_are_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        deletion.delete_threads([self.thread.id])
+
+        response = client.post(
+            f"/api/threads/threads/{self.thread.id}/react/",
+            {"reaction": "like"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ThreadReactions.objects.exists())
@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from threads import views
+from threads.models import Comment, Reply, Thread, ThreadReactions
+from users.models import User
+
+
+class ThreadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        self.thread = Thread.objects.create(user=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/threads/threads/{self.thread.id}/view/"
+
+    def comment(self, replies=0):
+        comment = Comment.objects.create(
+            thread=self.thread, user=self.user, content="c", comment_type="text"
+        )
+        Reply.objects.bulk_create(
+            Reply(
+                comment=comment, user=self.user, content=str(index), comment_type="text"
+            )
+            for index in range(replies)
+        )
+        return comment
+
+    def test_payload_embeds_comments_and_their_first_replies(self):
+        busy = self.comment(replies=views.THREAD_VIEW_REPLIES + 2)
+        quiet = self.comment(replies=1)
+        ThreadReactions.objects.create(
+            thread=self.thread, user=self.user, reaction="like"
+        )
+
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data["id"], self.thread.id)
+        self.assertIn("reaction_counts", data)
+        comments = data["comments"]["results"]
+        self.assertEqual([comment["id"] for comment in comments], [busy.id, quiet.id])
+        self.assertEqual(
+            [reply["content"] for reply in comments[0]["replies"]],
+            [str(index) for index in range(views.THREAD_VIEW_REPLIES)],
+        )
+        self.assertEqual(len(comments[1]["replies"]), 1)
+        self.assertIn("reaction_counts", comments[0]["replies"][0])
+
+    def test_query_count_does_not_grow_with_comments(self):
+        self.comment(replies=2)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+
+        for _ in range(3):
+            self.comment(replies=4)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url)
+
+        self.assertEqual(len(many), len(few))
@@ -1,9 +1,15 @@
 from rest_framework_nested.routers import DefaultRouter, NestedDefaultRouter
 
-from .views import CommentViewSet, ReplyViewSet, ThreadViewSet
+from .views import (
+    CommentViewSet,
+    ReactionSummaryViewSet,
+    ReplyViewSet,
+    ThreadViewSet,
+)
 
 router = DefaultRouter()
 router.register("threads", ThreadViewSet)
+router.register("reactions", ReactionSummaryViewSet, basename="reaction-summary")
 nested_thread_router = NestedDefaultRouter(router, r"threads", lookup="threads")
 nested_thread_router.register("comments", CommentViewSet)
 nested_comment_router = NestedDefaultRouter(
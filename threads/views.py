@@ -1,30 +1,38 @@
 # Create your views here.
-from django.db.models import Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, Value, prefetch_related_objects
+from django.urls import reverse
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import (
-    Comment,
-    CommentReactions,
-    Reply,
-    ReplyReactions,
-    Thread,
-    ThreadReactions,
-)
+from core.db import ReadDatabaseMixin
+from core.pagination import KeysetPagination
+from core.queries import QueryBudgetMixin, budgets
+from core.renderers import StreamingListMixin
+from users.graph import graph
+
+from . import counters, deletion, ranking, reactions
+from .models import Comment, Reply, Thread
 from .serializers import (
-    CommentReactionsSerializer,
     CommentSerializer,
+    CompiledCommentReactionsSerializer,
+    CompiledReplyReactionsSerializer,
+    CompiledThreadReactionsSerializer,
     ReactionSerializer,
-    ReplyReactionsSerializer,
     ReplySerializer,
     ThreadListSerializer,
-    ThreadReactionsSerializer,
     ThreadSerializer,
 )
 
+# Replies embedded under each comment by the thread view endpoint.
+THREAD_VIEW_REPLIES = getattr(settings, "THREAD_VIEW_REPLIES", 3)
+# Most ids per kind the reaction summary endpoint takes in one request.
+REACTION_SUMMARY_MAX_IDS = getattr(settings, "REACTION_SUMMARY_MAX_IDS", 300)
+
 
 def check_permission(user, object):
     if user == object.user:
@@ -32,17 +40,87 @@ def check_permission(user, object):
     raise PermissionDenied("You are not allowed to perform this action")
 
 
-class ThreadViewSet(viewsets.ModelViewSet):
+class ReactionPagination(KeysetPagination):
+    page_size = 50
+
+
+def list_reactions(request, kind, obj, serializer_class):
+    """A keyset page of reactions to ``obj``, newest first.
+
+    ``?reaction=<type>`` filters by type and ``?following_first=1`` lists
+    reactions by accounts the caller follows before everyone else's.
+    """
+    model, fk, _ = reactions.KINDS[kind]
+    queryset = model.objects.filter(**{fk: obj})
+    reaction = request.query_params.get("reaction")
+    if reaction:
+        queryset = queryset.filter(reaction=reaction)
+
+    paginator = ReactionPagination()
+    ordering = ("-followed", "-created_at", "-id")
+    position = paginator.begin(request, ordering, model)
+
+    if request.query_params.get("following_first"):
+        following = graph.following_ids(request.user)
+        sources = [
+            queryset.filter(user_id__in=following).annotate(followed=Value(1)),
+            queryset.exclude(user_id__in=following).annotate(followed=Value(0)),
+        ]
+    else:
+        sources = [queryset.annotate(followed=Value(0))]
+    limit = paginator.page_size + 1
+    rows = []
+    for source in sources:
+        if position is not None:
+            source = source.filter(paginator.seek(position))
+        rows += source.order_by("-created_at", "-id")[: limit - len(rows)]
+        if len(rows) == limit:
+            break
+    page = paginator.end(rows)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
+
+class ThreadViewSet(
+    QueryBudgetMixin, ReadDatabaseMixin, StreamingListMixin, viewsets.ModelViewSet
+):
     queryset = Thread.objects.all()
     permission_classes = [IsAuthenticated]
+    read_actions = frozenset(
+        {
+            "list",
+            "retrieve",
+            "get_reactions",
+            "get_reactions_count",
+            "thread_view",
+        }
+    )
+    query_budgets = budgets(
+        list=1,
+        retrieve=3,
+        create=11,
+        update=11,
+        partial_update=11,
+        destroy=11,
+        get_reactions=3,
+        react=1,
+        get_reactions_count=2,
+        thread_view=8,
+    )
 
     def get_serializer_class(self):
         if self.action == "list":
             return ThreadListSerializer
         return ThreadSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            return queryset.select_related("cover_image")
+        return queryset
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        thread = serializer.save(user=self.request.user)
+        ranking.refresh([thread.pk])
 
     def update(self, request, *args, **kwargs):
         check_permission(request.user, self.get_object())
@@ -52,10 +130,14 @@ class ThreadViewSet(viewsets.ModelViewSet):
         check_permission(request.user, self.get_object())
         return super().destroy(request, *args, **kwargs)
 
+    def perform_destroy(self, instance):
+        deletion.delete_threads([instance.pk])
+
     @action(detail=True, methods=["get"], url_path="reactions")
     def get_reactions(self, *args, **kwargs):
-        results = ThreadReactions.objects.filter(thread=self.get_object())
-        return Response(ThreadReactionsSerializer(results, many=True).data)
+        return list_reactions(
+            self.request, "thread", self.get_object(), CompiledThreadReactionsSerializer
+        )
 
     @action(detail=True, methods=["post"], url_path="react")
     def react(self, request, *args, **kwargs):
@@ -63,27 +145,77 @@ class ThreadViewSet(viewsets.ModelViewSet):
         if not reaction.is_valid():
             raise PermissionDenied("reaction is required")
         thread = self.get_object()
-        reaction_obj, created = ThreadReactions.objects.update_or_create(
-            thread=thread,
-            user=self.request.user,
-            defaults={"reaction": reaction.validated_data["reaction"]},
+        reactions.buffer.add(
+            "thread", thread.pk, request.user.pk, reaction.validated_data["reaction"]
         )
         return Response({"reaction": reaction.validated_data["reaction"]})
 
     @action(detail=True, methods=["get"], url_path="reactions-count")
     def get_reactions_count(self, request, *args, **kwargs):
-        reaction_counts = (
-            ThreadReactions.objects.filter(thread=self.get_object())
-            .values("reaction")
-            .annotate(count=Count("id"))
+        thread = self.get_object()
+        return Response(counters.reaction_histogram(Thread, thread.pk))
+
+    @action(detail=True, methods=["get"], url_path="view")
+    def thread_view(self, request, *args, **kwargs):
+        thread = self.get_object()
+        paginator = KeysetPagination()
+        comments = paginator.paginate_queryset(
+            Comment.objects.filter(thread=thread).order_by("created_at"), request
+        )
+        replies = Reply.objects.order_by("created_at", "id")[:THREAD_VIEW_REPLIES]
+        prefetch_related_objects(
+            comments, Prefetch("replies", queryset=replies, to_attr="first_replies")
+        )
+        first_replies = [
+            reply for comment in comments for reply in comment.first_replies
+        ]
+
+        thread_counts = counters.reaction_histograms(Thread, [thread.pk])
+        comment_counts = counters.reaction_histograms(
+            Comment, [comment.pk for comment in comments]
         )
-        return Response(reaction_counts)
+        reply_counts = counters.reaction_histograms(
+            Reply, [reply.pk for reply in first_replies]
+        )
+
+        context = self.get_serializer_context()
+        data = ThreadSerializer(thread, context=context).data
+        data["reaction_counts"] = thread_counts[thread.pk]
+        results = CommentSerializer(comments, many=True, context=context).data
+        for comment, item in zip(comments, results):
+            item["reaction_counts"] = comment_counts[comment.pk]
+            item["replies"] = ReplySerializer(
+                comment.first_replies, many=True, context=context
+            ).data
+            for reply, reply_item in zip(comment.first_replies, item["replies"]):
+                reply_item["reaction_counts"] = reply_counts[reply.pk]
+        comments_url = request.build_absolute_uri(
+            reverse("comment-list", kwargs={"threads_pk": thread.pk})
+        )
+        data["comments"] = {
+            "next": paginator.get_next_link(comments_url),
+            "results": results,
+        }
+        return Response(data)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(QueryBudgetMixin, ReadDatabaseMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
+    read_actions = frozenset(
+        {"list", "retrieve", "get_reactions", "get_reactions_count"}
+    )
+    query_budgets = budgets(
+        list=2,
+        retrieve=2,
+        create=5,
+        destroy=12,
+        get_reactions=3,
+        react=2,
+        get_reactions_count=3,
+    )
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_thread(self):
         try:
@@ -92,10 +224,17 @@ class CommentViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Thread not found")
 
     def get_queryset(self, *args, **kwargs):
-        return Comment.objects.filter(thread=self.get_thread())
+        return Comment.objects.filter(thread=self.get_thread()).order_by("created_at")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user, thread=self.get_thread())
+        thread = self.get_thread()
+        with transaction.atomic():
+            serializer.save(user=self.request.user, thread=thread)
+            counters.adjust(Thread, thread.pk, comments_count=1)
+            ranking.refresh([thread.pk])
+
+    def perform_destroy(self, instance):
+        deletion.delete_comments([instance.pk])
 
     def update(self, request, *args, **kwargs):
         check_permission(request.user, self.get_object())
@@ -107,8 +246,12 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"], url_path="reactions")
     def get_reactions(self, *args, **kwargs):
-        results = CommentReactions.objects.filter(comment=self.get_object())
-        return Response(CommentReactionsSerializer(results, many=True).data)
+        return list_reactions(
+            self.request,
+            "comment",
+            self.get_object(),
+            CompiledCommentReactionsSerializer,
+        )
 
     @action(detail=True, methods=["post"], url_path="react")
     def react(self, request, *args, **kwargs):
@@ -116,30 +259,36 @@ class CommentViewSet(viewsets.ModelViewSet):
         if not reaction.is_valid():
             raise PermissionDenied("reaction is required")
         comment = self.get_object()
-        reaction_obj, created = CommentReactions.objects.update_or_create(
-            comment=comment,
-            user=self.request.user,
-            defaults={"reaction": reaction.validated_data["reaction"]},
+        reactions.buffer.add(
+            "comment", comment.pk, request.user.pk, reaction.validated_data["reaction"]
         )
         return Response({"reaction": reaction.validated_data["reaction"]})
 
     @action(detail=True, methods=["get"], url_path="reactions-count")
     def get_reactions_count(self, request, *args, **kwargs):
-        reaction_counts = (
-            CommentReactions.objects.filter(comment=self.get_object())
-            .values("reaction")
-            .annotate(count=Count("id"))
-        )
-        return Response(reaction_counts)
+        comment = self.get_object()
+        return Response(counters.reaction_histogram(Comment, comment.pk))
 
 
-class ReplyViewSet(viewsets.ModelViewSet):
+class ReplyViewSet(QueryBudgetMixin, ReadDatabaseMixin, viewsets.ModelViewSet):
     queryset = Reply.objects.all()
+    read_actions = frozenset(
+        {"list", "retrieve", "get_reactions", "get_reactions_count"}
+    )
+    query_budgets = budgets(
+        list=2,
+        retrieve=2,
+        create=3,
+        get_reactions=3,
+        react=2,
+        get_reactions_count=3,
+    )
     serializer_class = ReplySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self, *args, **kwargs):
-        return Reply.objects.filter(comment=self.get_comment())
+        return Reply.objects.filter(comment=self.get_comment()).order_by("created_at")
 
     def get_comment(self):
         try:
@@ -148,7 +297,15 @@ class ReplyViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Comment not found")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user, comment=self.get_comment())
+        comment = self.get_comment()
+        with transaction.atomic():
+            serializer.save(user=self.request.user, comment=comment)
+            counters.adjust(Comment, comment.pk, replies_count=1)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            counters.adjust(Comment, instance.comment_id, replies_count=-1)
 
     def update(self, request, *args, **kwargs):
         check_permission(request.user, self.get_object())
@@ -160,8 +317,9 @@ class ReplyViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"], url_path="reactions")
     def get_reactions(self, *args, **kwargs):
-        results = ReplyReactions.objects.filter(reply=self.get_object())
-        return Response(ReplyReactionsSerializer(results, many=True).data)
+        return list_reactions(
+            self.request, "reply", self.get_object(), CompiledReplyReactionsSerializer
+        )
 
     @action(detail=True, methods=["post"], url_path="react")
     def react(self, request, *args, **kwargs):
@@ -169,18 +327,44 @@ class ReplyViewSet(viewsets.ModelViewSet):
         if not reaction.is_valid():
             raise PermissionDenied("reaction is required")
         reply = self.get_object()
-        reaction_obj, created = ReplyReactions.objects.update_or_create(
-            reply=reply,
-            user=self.request.user,
-            defaults={"reaction": reaction.validated_data["reaction"]},
+        reactions.buffer.add(
+            "reply", reply.pk, request.user.pk, reaction.validated_data["reaction"]
         )
         return Response({"reaction": reaction.validated_data["reaction"]})
 
     @action(detail=True, methods=["get"], url_path="reactions-count")
     def get_reactions_count(self, request, *args, **kwargs):
-        reaction_counts = (
-            ReplyReactions.objects.filter(reply=self.get_object())
-            .values("reaction")
-            .annotate(count=Count("id"))
-        )
-        return Response(reaction_counts)
+        reply = self.get_object()
+        return Response(counters.reaction_histogram(Reply, reply.pk))
+
+
+class ReactionSummaryViewSet(QueryBudgetMixin, ReadDatabaseMixin, viewsets.ViewSet):
+    """Reaction counts and the caller's own reaction for many objects.
+
+    ``?thread=1,2&comment=3&reply=4,5`` returns, per kind and id,
+    ``{"reaction_counts": [...], "my_reaction": ...}``.
+    """
+
+    query_budgets = budgets(list=6)
+
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        data = {}
+        for kind in reactions.KINDS:
+            ids = self.get_ids(kind)
+            if ids:
+                data[kind] = reactions.summaries(kind, ids, request.user.pk)
+        return Response(data)
+
+    def get_ids(self, kind):
+        value = self.request.query_params.get(kind, "")
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(",") if pk))
+        except ValueError:
+            raise ValidationError({kind: "Expected comma-separated ids."})
+        if len(ids) > REACTION_SUMMARY_MAX_IDS:
+            raise ValidationError(
+                {kind: f"At most {REACTION_SUMMARY_MAX_IDS} ids are allowed."}
+            )
+        return ids
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import User
+
+# A user card is the UserListSerializer representation of a user, the form in
+# which users are embedded in threads, feeds and reactions. Cards are kept in
+# the default cache and, for USER_CARD_LRU_TIMEOUT seconds, in a per-process
+# LRU in front of it.
+USER_CARD_CACHE_TIMEOUT = getattr(settings, "USER_CARD_CACHE_TIMEOUT", 300)
+USER_CARD_LRU_SIZE = getattr(settings, "USER_CARD_LRU_SIZE", 10000)
+USER_CARD_LRU_TIMEOUT = getattr(settings, "USER_CARD_LRU_TIMEOUT", 5)
+# User columns that appear on a card; saves touching only other columns
+# (e.g. last_login) leave cached cards alone.
+CARD_FIELDS = {"username", "avatar", "is_verified"}
+
+
+def _key(user_id):
+    return f"user-card:{user_id}"
+
+
+class CardCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # user_id -> (card, monotonic time it expires at)
+            self._cards = OrderedDict()
+
+    def _remember(self, cards):
+        expires_at = time.monotonic() + USER_CARD_LRU_TIMEOUT
+        with self._lock:
+            for user_id, card in cards.items():
+                self._cards[user_id] = (card, expires_at)
+                self._cards.move_to_end(user_id)
+            while len(self._cards) > USER_CARD_LRU_SIZE:
+                self._cards.popitem(last=False)
+
+    def _load(self, user_ids):
+        from .serializers import CompiledUserListSerializer
+
+        rows = User.objects.filter(id__in=user_ids).values(
+            "id", "username", "is_verified", "avatar__id", "avatar__image"
+        )
+        return {
+            card["id"]: card
+            for card in CompiledUserListSerializer(rows, many=True).data
+        }
+
+    def get_many(self, user_ids):
+        """Return ``{user_id: card}``; ids of users that do not exist are left out."""
+        now = time.monotonic()
+        cards = {}
+        missing = []
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                entry = self._cards.get(user_id)
+                if entry is None or entry[1] <= now:
+                    missing.append(user_id)
+                else:
+                    self._cards.move_to_end(user_id)
+                    cards[user_id] = entry[0]
+        if not missing:
+            return cards
+
+        keys = {_key(user_id): user_id for user_id in missing}
+        found = {keys[key]: card for key, card in cache.get_many(keys).items()}
+        loaded = self._load([user_id for user_id in missing if user_id not in found])
+        if loaded:
+            cache.set_many(
+                {_key(user_id): card for user_id, card in loaded.items()},
+                USER_CARD_CACHE_TIMEOUT,
+            )
+        found.update(loaded)
+        self._remember(found)
+        cards.update(found)
+        return cards
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(user_id)
+
+    def invalidate(self, user_ids):
+        user_ids = list(user_ids)
+        cache.delete_many([_key(user_id) for user_id in user_ids])
+        with self._lock:
+            for user_id in user_ids:
+                self._cards.pop(user_id, None)
+
+
+cards = CardCache()
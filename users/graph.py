@@ -0,0 +1,251 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core import shards
+
+from .models import Followers
+
+# Processes notice follow changes through this counter in the default cache
+# and replay the ones they missed from the change log, reloading the whole
+# graph only when some have expired.
+GRAPH_VERSION_KEY = "follow-graph:version"
+GRAPH_CHANGE_TIMEOUT = getattr(settings, "FOLLOW_GRAPH_CHANGE_TIMEOUT", 3600)
+GRAPH_CHECK_INTERVAL = getattr(settings, "FOLLOW_GRAPH_CHECK_INTERVAL", 1)
+# Pending edits are folded back into the CSR arrays past this many changes.
+GRAPH_COMPACT_THRESHOLD = getattr(settings, "FOLLOW_GRAPH_COMPACT_THRESHOLD", 10000)
+
+
+def _change_key(version):
+    return f"follow-graph:change:{version}"
+
+
+def _id(user):
+    return getattr(user, "pk", user)
+
+
+class Adjacency:
+    """One direction of the follow graph in CSR form, plus per-user edit sets
+    that ``compact()`` folds in. Readers take no lock: state is published as
+    one tuple and edits replace sets instead of mutating them."""
+
+    def __init__(self, pairs):
+        self.build(pairs)
+
+    def build(self, pairs):
+        """Build from ``(source, target)`` pairs sorted by source then target."""
+        size = pairs[-1][0] + 2 if pairs else 1
+        offsets = array("q", bytes(8 * size))
+        targets = array("q")
+        for source, target in pairs:
+            offsets[source + 1] += 1
+            targets.append(target)
+        for index in range(1, size):
+            offsets[index] += offsets[index - 1]
+        self._state = (offsets, targets, {}, {})
+        self.pending = 0
+
+    @staticmethod
+    def _bounds(offsets, source):
+        if source + 1 >= len(offsets):
+            return 0, 0
+        return offsets[source], offsets[source + 1]
+
+    def _in_base(self, offsets, targets, source, target):
+        lo, hi = self._bounds(offsets, source)
+        index = bisect_left(targets, target, lo, hi)
+        return index < hi and targets[index] == target
+
+    def neighbors(self, source):
+        offsets, targets, added, removed = self._state
+        lo, hi = self._bounds(offsets, source)
+        base = targets[lo:hi]
+        added = added.get(source)
+        removed = removed.get(source)
+        if not added and not removed:
+            return base.tolist()
+        return sorted((set(base) - (removed or set())) | (added or set()))
+
+    def contains(self, source, target):
+        offsets, targets, added, removed = self._state
+        if target in removed.get(source, ()):
+            return False
+        if target in added.get(source, ()):
+            return True
+        return self._in_base(offsets, targets, source, target)
+
+    def degree(self, source):
+        offsets, _, added, removed = self._state
+        lo, hi = self._bounds(offsets, source)
+        return hi - lo + len(added.get(source, ())) - len(removed.get(source, ()))
+
+    def sources(self):
+        offsets, _, added, _ = self._state
+        sources = {
+            source
+            for source in range(len(offsets) - 1)
+            if offsets[source + 1] > offsets[source]
+        }
+        return sources | {source for source, targets in added.items() if targets}
+
+    def add(self, source, target):
+        offsets, targets, added, removed = self._state
+        if target in removed.get(source, ()):
+            removed[source] = removed[source] - {target}
+        elif not self._in_base(offsets, targets, source, target):
+            added[source] = added.get(source, frozenset()) | {target}
+        self._touch()
+
+    def remove(self, source, target):
+        offsets, targets, added, removed = self._state
+        if target in added.get(source, ()):
+            added[source] = added[source] - {target}
+        elif self._in_base(offsets, targets, source, target):
+            removed[source] = removed.get(source, frozenset()) | {target}
+        self._touch()
+
+    def _touch(self):
+        self.pending += 1
+        if self.pending >= GRAPH_COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        self.build(
+            [
+                (source, target)
+                for source in sorted(self.sources())
+                for target in self.neighbors(source)
+            ]
+        )
+
+
+class FollowGraph:
+    """Process-local index of active follows, loaded lazily from ``Followers``."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._following = None
+            self._followers = None
+            self._version = None
+            self._checked_at = 0
+
+    def _load(self, version):
+        pairs = sorted(
+            {
+                pair
+                for queryset in shards.fan_out(
+                    Followers.objects.filter(unfollowed_at__isnull=True)
+                )
+                for pair in queryset.values_list("follower_id", "following_id")
+            }
+        )
+        following = Adjacency(pairs)
+        followers = Adjacency(
+            sorted((following, follower) for follower, following in pairs)
+        )
+        with self._lock:
+            self._following = following
+            self._followers = followers
+            self._version = version
+
+    def _replay(self, operation, follower_id, following_id):
+        getattr(self._following, operation)(follower_id, following_id)
+        getattr(self._followers, operation)(following_id, follower_id)
+
+    def _catch_up(self, version):
+        """Apply the logged changes up to ``version``; False if any expired."""
+        if self._version is None or version < self._version:
+            return False
+        keys = [_change_key(number) for number in range(self._version + 1, version + 1)]
+        if len(keys) > GRAPH_COMPACT_THRESHOLD:
+            return False
+        changes = cache.get_many(keys)
+        if len(changes) < len(keys):
+            return False
+        # Changes this process applied itself come round again; following or
+        # unfollowing twice is harmless, and the log keeps the order.
+        for key in keys:
+            self._replay(*changes[key])
+        self._version = version
+        return True
+
+    def _ensure_loaded(self):
+        now = time.monotonic()
+        if (
+            self._following is not None
+            and now - self._checked_at < GRAPH_CHECK_INTERVAL
+        ):
+            return
+        with self._lock:
+            version = cache.get(GRAPH_VERSION_KEY, 0)
+            if self._following is None or not self._catch_up(version):
+                self._load(version)
+            self._checked_at = now
+
+    def _bump_version(self):
+        if cache.add(GRAPH_VERSION_KEY, 1, None):
+            return 1
+        try:
+            return cache.incr(GRAPH_VERSION_KEY)
+        except ValueError:
+            return None
+
+    def _apply(self, operation, follower_id, following_id):
+        with self._lock:
+            version = self._bump_version()
+            if version is not None:
+                cache.set(
+                    _change_key(version),
+                    (operation, follower_id, following_id),
+                    GRAPH_CHANGE_TIMEOUT,
+                )
+            if self._following is None:
+                return
+            self._replay(operation, follower_id, following_id)
+            if version is None:
+                # The counter was lost; reload on the next read.
+                self._version = None
+                self._checked_at = 0
+            elif self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                # Someone else changed the graph in between; catch up from the
+                # change log on the next read.
+                self._checked_at = 0
+
+    def follow(self, follower, following):
+        self._apply("add", _id(follower), _id(following))
+
+    def unfollow(self, follower, following):
+        self._apply("remove", _id(follower), _id(following))
+
+    def following_ids(self, user):
+        self._ensure_loaded()
+        return self._following.neighbors(_id(user))
+
+    def follower_ids(self, user):
+        self._ensure_loaded()
+        return self._followers.neighbors(_id(user))
+
+    def is_following(self, follower, following):
+        self._ensure_loaded()
+        return self._following.contains(_id(follower), _id(following))
+
+    def following_count(self, user):
+        self._ensure_loaded()
+        return self._following.degree(_id(user))
+
+    def follower_count(self, user):
+        self._ensure_loaded()
+        return self._followers.degree(_id(user))
+
+
+graph = FollowGraph()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users import suggestions
+
+
+class Command(BaseCommand):
+    help = "Precompute friend-of-friend suggestions for every user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="*", type=int)
+        parser.add_argument("--top-k", type=int, default=suggestions.SUGGESTIONS_TOP_K)
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        built = suggestions.build(
+            user_ids=options["user_ids"] or None,
+            top_k=options["top_k"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Built suggestions for {built} users"))
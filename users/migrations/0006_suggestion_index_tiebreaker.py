@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0005_unenforced_follow_keys"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="suggestion",
+            name="users_sugge_user_id_bbb581_idx",
+        ),
+        migrations.AddIndex(
+            model_name="suggestion",
+            index=models.Index(
+                fields=["user", "-score", "suggested"],
+                name="users_sugge_user_id_eee83f_idx",
+            ),
+        ),
+    ]
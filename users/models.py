@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from core.shards import ShardedManager
+
 
 class User(AbstractUser):
     github_url = models.URLField(blank=True, null=True)
@@ -20,5 +22,23 @@ class Followers(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     unfollowed_at = models.DateTimeField(default=None, null=True)
 
+    objects = ShardedManager()
+    shard_key = "follower"
+
     def __str__(self):
         return f"{self.follower} → {self.following}"
+
+
+class Suggestion(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="suggestions")
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    mutual_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user} → {self.suggested} ({self.score})"
+
+    class Meta:
+        unique_together = ("user", "suggested")
+        indexes = [models.Index(fields=["user", "-score", "suggested"])]
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 
-from core.serializers import ImageSerializer
+from core.compiled import CompiledSerializer, Nested
+from core.serializers import CompiledImageSerializer, ImageSerializer
 
+from .cards import cards
+from .graph import graph
 from .models import Followers, User
 
 
@@ -49,10 +52,10 @@ class UserDetailForOthersSerializer(serializers.ModelSerializer):
         ]
 
     def get_followers_count(self, obj):
-        return obj.followers.filter(unfollowed_at__isnull=True).count()
+        return graph.follower_count(obj)
 
     def get_following_count(self, obj):
-        return obj.following.filter(unfollowed_at__isnull=True).count()
+        return graph.following_count(obj)
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -79,6 +82,33 @@ class UserListSerializer(serializers.ModelSerializer):
         return representation
 
 
+class CompiledUserListSerializer(CompiledSerializer):
+    serializer_class = UserListSerializer
+    nested = {"avatar": Nested(CompiledImageSerializer)}
+
+
+class UserCardField(serializers.Field):
+    """Read-only embed of a related user as its cached card.
+
+    Reads ``<field name>_id`` by default, so the user row is never loaded.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        if self.source is None:
+            self.source = f"{field_name}_id"
+        super().bind(field_name, parent)
+
+    def prefetch(self, user_ids):
+        cards.get_many(user_ids)
+
+    def to_representation(self, value):
+        return cards.get(value)
+
+
 class FollowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Followers
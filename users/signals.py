@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core import shards
+from core.models import Image
+
+from .cards import CARD_FIELDS, cards
+from .graph import graph
+from .models import Followers, User
+
+
+@receiver(post_save, sender=Followers)
+def sync_graph_on_follow(sender, instance, created, **kwargs):
+    if instance.unfollowed_at is not None:
+        transaction.on_commit(
+            lambda: graph.unfollow(instance.follower_id, instance.following_id)
+        )
+    elif created:
+        transaction.on_commit(
+            lambda: graph.follow(instance.follower_id, instance.following_id)
+        )
+
+
+@receiver(post_delete, sender=Followers)
+def sync_graph_on_delete(sender, instance, **kwargs):
+    if instance.unfollowed_at is None and not shards.is_moving():
+        transaction.on_commit(
+            lambda: graph.unfollow(instance.follower_id, instance.following_id)
+        )
+
+
+@receiver(post_save, sender=User)
+def invalidate_card_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or CARD_FIELDS & set(update_fields):
+        transaction.on_commit(lambda: cards.invalidate([instance.pk]))
+
+
+@receiver(post_save, sender=Image)
+@receiver(pre_delete, sender=Image)
+def invalidate_cards_on_avatar_change(sender, instance, **kwargs):
+    user_ids = list(User.objects.filter(avatar=instance).values_list("id", flat=True))
+    if user_ids:
+        transaction.on_commit(lambda: cards.invalidate(user_ids))
@@ -0,0 +1,106 @@
+import heapq
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from .graph import graph
+from .models import Suggestion, User
+
+SUGGESTIONS_TOP_K = getattr(settings, "SUGGESTIONS_TOP_K", 50)
+# Each shared `User.stack` entry is worth this many mutual connections.
+SUGGESTIONS_STACK_WEIGHT = getattr(settings, "SUGGESTIONS_STACK_WEIGHT", 0.5)
+
+
+def _stack(value):
+    return {str(item).lower() for item in value} if isinstance(value, list) else set()
+
+
+def load_stacks(user_ids=None):
+    users = User.objects.all()
+    if user_ids is not None:
+        users = users.filter(id__in=user_ids)
+    return {
+        user_id: _stack(stack) for user_id, stack in users.values_list("id", "stack")
+    }
+
+
+def mutual_counts(user_id):
+    """One row of the sparse product ``F @ G`` of the follow matrices.
+
+    The count for a candidate is how many of ``user_id``'s followers already
+    follow them; accounts the user follows (and the user) are left out.
+    """
+    mutual = Counter()
+    for follower_id in graph.follower_ids(user_id):
+        mutual.update(graph.following_ids(follower_id))
+    for excluded in graph.following_ids(user_id):
+        mutual.pop(excluded, None)
+    mutual.pop(user_id, None)
+    return mutual
+
+
+def rank_candidates(user_id, stacks, top_k=SUGGESTIONS_TOP_K, mutual=None):
+    """Return ``(score, mutual_count, candidate_id)`` for the best candidates."""
+    if mutual is None:
+        mutual = mutual_counts(user_id)
+    own_stack = stacks.get(user_id, set())
+    scored = (
+        (
+            count
+            + SUGGESTIONS_STACK_WEIGHT * len(own_stack & stacks.get(candidate, set())),
+            count,
+            candidate,
+        )
+        for candidate, count in mutual.items()
+    )
+    return heapq.nlargest(top_k, scored)
+
+
+def build(user_ids=None, top_k=SUGGESTIONS_TOP_K, chunk_size=500):
+    """Recompute and store the top ``top_k`` suggestions for every user."""
+    stacks = load_stacks()
+    if user_ids is None:
+        user_ids = sorted(stacks)
+    built = 0
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start : start + chunk_size]
+        rows = [
+            Suggestion(
+                user_id=user_id,
+                suggested_id=candidate,
+                score=score,
+                mutual_count=count,
+            )
+            for user_id in chunk
+            for score, count, candidate in rank_candidates(user_id, stacks, top_k)
+        ]
+        with transaction.atomic():
+            Suggestion.objects.filter(user_id__in=chunk).delete()
+            Suggestion.objects.bulk_create(rows)
+        built += len(chunk)
+    return built
+
+
+def suggested_ids(user_id, top_k=SUGGESTIONS_TOP_K):
+    """Stored suggestions for ``user_id``, best first.
+
+    Users that have not been through a batch run yet are ranked on the fly.
+    """
+    ids = list(
+        Suggestion.objects.filter(user_id=user_id)
+        .order_by("-score", "suggested_id")
+        .values_list("suggested_id", flat=True)[:top_k]
+    )
+    if not ids:
+        mutual = mutual_counts(user_id)
+        stacks = load_stacks([user_id, *mutual])
+        ids = [
+            candidate
+            for _, _, candidate in rank_candidates(user_id, stacks, top_k, mutual)
+        ]
+    return [
+        suggested_id
+        for suggested_id in ids
+        if not graph.is_following(user_id, suggested_id)
+    ]
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from users.cards import cards
+from users.models import User
+
+
+class CardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        cards.reset()
+        self.user = User.objects.create(username="before")
+
+    def test_cards_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(cards.get(self.user.id)["username"], "before")
+        cards.reset()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cards.get(self.user.id)["username"], "before")
+
+    def test_missing_users_are_left_out(self):
+        self.assertEqual(list(cards.get_many([self.user.id, 0])), [self.user.id])
+
+    def test_card_fields_invalidate_the_card(self):
+        cards.get(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "after"
+            self.user.save()
+
+        self.assertEqual(cards.get(self.user.id)["username"], "after")
+
+    def test_other_fields_keep_the_card(self):
+        cards.get(self.user.id)
+        User.objects.filter(pk=self.user.pk).update(username="after")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.last_login = timezone.now()
+            self.user.save(update_fields=["last_login"])
+
+        self.assertEqual(cards.get(self.user.id)["username"], "before")
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from users import graph as graph_module
+from users.graph import Adjacency, FollowGraph
+from users.models import Followers, User
+
+
+class AdjacencyTests(TestCase):
+    def test_edits_overlay_the_csr_arrays_until_compacted(self):
+        adjacency = Adjacency([(1, 2), (1, 3), (4, 1)])
+
+        adjacency.add(1, 5)
+        adjacency.remove(1, 2)
+        adjacency.remove(4, 1)
+
+        self.assertEqual(adjacency.neighbors(1), [3, 5])
+        self.assertEqual(adjacency.neighbors(4), [])
+        self.assertEqual(adjacency.degree(1), 2)
+        self.assertFalse(adjacency.contains(1, 2))
+        self.assertTrue(adjacency.contains(1, 5))
+
+        adjacency.compact()
+
+        self.assertEqual(adjacency.pending, 0)
+        self.assertEqual(adjacency.sources(), {1})
+        self.assertEqual(adjacency.neighbors(1), [3, 5])
+
+    def test_unknown_sources_have_no_neighbors(self):
+        adjacency = Adjacency([])
+
+        self.assertEqual(adjacency.neighbors(10), [])
+        self.assertEqual(adjacency.degree(10), 0)
+
+
+@mock.patch.object(graph_module, "GRAPH_CHECK_INTERVAL", 0)
+class FollowGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice, self.bob, self.carol = (
+            User.objects.create(username=name) for name in ("alice", "bob", "carol")
+        )
+        Followers.objects.create(follower=self.alice, following=self.bob)
+        self.graph = FollowGraph()
+
+    def follow(self, follower, following):
+        with self.captureOnCommitCallbacks(execute=True):
+            Followers.objects.create(follower=follower, following=following)
+
+    def test_loads_active_follows(self):
+        Followers.objects.create(
+            follower=self.carol, following=self.bob, unfollowed_at=timezone.now()
+        )
+
+        self.assertEqual(self.graph.following_ids(self.alice), [self.bob.id])
+        self.assertEqual(self.graph.follower_ids(self.bob), [self.alice.id])
+        self.assertTrue(self.graph.is_following(self.alice, self.bob))
+        self.assertFalse(self.graph.is_following(self.carol, self.bob))
+
+    def test_other_processes_replay_the_change_log(self):
+        self.assertEqual(self.graph.follower_count(self.bob), 1)
+
+        self.follow(self.carol, self.bob)
+        follow = Followers.objects.get(follower=self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            follow.unfollowed_at = timezone.now()
+            follow.save()
+
+        with mock.patch.object(self.graph, "_load") as load:
+            self.assertEqual(self.graph.follower_ids(self.bob), [self.carol.id])
+        load.assert_not_called()
+
+    def test_expired_changes_reload_the_graph(self):
+        self.graph.following_ids(self.carol)
+
+        self.follow(self.carol, self.bob)
+        cache.delete(
+            graph_module._change_key(cache.get(graph_module.GRAPH_VERSION_KEY))
+        )
+
+        self.assertEqual(self.graph.following_ids(self.carol), [self.bob.id])
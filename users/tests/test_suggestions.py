@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users import suggestions
+from users.graph import graph
+from users.models import Followers, Suggestion, User
+
+
+class SuggestionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        graph.reset()
+        self.alice, self.bob, self.carol, self.dave, self.erin = (
+            User.objects.create(username=name)
+            for name in ("alice", "bob", "carol", "dave", "erin")
+        )
+        # Bob and Carol follow Alice; both follow Dave, only Bob follows Erin.
+        for follower, following in [
+            (self.bob, self.alice),
+            (self.carol, self.alice),
+            (self.bob, self.dave),
+            (self.carol, self.dave),
+            (self.bob, self.erin),
+        ]:
+            Followers.objects.create(follower=follower, following=following)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def suggested(self):
+        response = self.client.get("/api/users/suggested-users/")
+        return [user["id"] for user in response.json()]
+
+    def test_candidates_are_ranked_by_mutual_followers(self):
+        self.assertEqual(
+            dict(suggestions.mutual_counts(self.alice.id)),
+            {self.dave.id: 2, self.erin.id: 1},
+        )
+        self.assertEqual(self.suggested()[0], self.dave.id)
+
+    def test_shared_stack_breaks_ties(self):
+        User.objects.filter(pk__in=[self.alice.pk, self.erin.pk]).update(
+            stack=["Python"]
+        )
+
+        self.assertEqual(self.suggested()[:2], [self.dave.id, self.erin.id])
+
+    def test_batch_results_are_stored_and_skip_followed_users(self):
+        call_command("build_suggestions", self.alice.id, stdout=StringIO())
+        self.assertEqual(
+            Suggestion.objects.get(user=self.alice, suggested=self.dave).mutual_count,
+            2,
+        )
+
+        Followers.objects.create(follower=self.alice, following=self.dave)
+        graph.reset()
+
+        self.assertNotIn(self.dave.id, self.suggested())
@@ -1,3 +1,6 @@
+import random
+
+from django.db.models import Case, When
 from django.utils import timezone
 from rest_framework.decorators import action
 from rest_framework.exceptions import MethodNotAllowed, PermissionDenied
@@ -6,25 +9,32 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from core.db import ReadDatabaseMixin
+from core.queries import QueryBudgetMixin, budgets
+
+from . import suggestions
 from .models import Followers, User
 from .serializers import (
+    CompiledUserListSerializer,
     FollowSerializer,
     UserDetailForOthersSerializer,
-    UserListSerializer,
     UserSerializer,
 )
 
+SUGGESTIONS_PAGE_SIZE = 20
 
-class UserViewSet(ModelViewSet):
-    queryset = User.objects.all()
+
+class UserViewSet(QueryBudgetMixin, ReadDatabaseMixin, ModelViewSet):
+    queryset = User.objects.select_related("avatar")
     serializer_class = UserSerializer
+    query_budgets = budgets(list=1, retrieve=1, partial_update=5, me=0)
     permission_classes = [IsAuthenticated]
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return UserDetailForOthersSerializer
         elif self.action == "list":
-            return UserListSerializer
+            return CompiledUserListSerializer
         return UserSerializer
 
     def create(self, request, *args, **kwargs):
@@ -45,9 +55,11 @@ class UserViewSet(ModelViewSet):
         return Response(UserSerializer(request.user).data)
 
 
-class FollowViewSet(ModelViewSet):
-    queryset = Followers.objects.all().select_related("following")
+class FollowViewSet(QueryBudgetMixin, ModelViewSet):
+    # prefetch rather than join: follows may live in a shard database.
+    queryset = Followers.objects.all().prefetch_related("following")
     serializer_class = FollowSerializer
+    query_budgets = budgets(list=2, retrieve=2, create=7, destroy=6)
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
@@ -69,33 +81,24 @@ class FollowViewSet(ModelViewSet):
         raise MethodNotAllowed("You can only create or delete a follow")
 
 
-class SuggestedUsersView(GenericViewSet, ListModelMixin):
+class SuggestedUsersView(
+    QueryBudgetMixin, ReadDatabaseMixin, GenericViewSet, ListModelMixin
+):
     queryset = User.objects.all()
-    serializer_class = UserListSerializer
+    serializer_class = CompiledUserListSerializer
+    query_budgets = budgets(list=3)
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-
-        # 1. Users you already follow
-        already_following_ids = Followers.objects.filter(
-            follower=user, unfollowed_at__isnull=True
-        ).values_list("following_id", flat=True)
-
-        # 2. Your followers
-        your_followers_ids = Followers.objects.filter(
-            following=user, unfollowed_at__isnull=True
-        ).values_list("follower_id", flat=True)
-
-        # 3. People your followers are following
-        friends_of_friends_ids = (
-            Followers.objects.filter(
-                follower_id__in=your_followers_ids, unfollowed_at__isnull=True
+        ids = suggestions.suggested_ids(self.request.user.id)
+        if self.request.query_params.get("sample"):
+            ids = random.sample(ids, min(SUGGESTIONS_PAGE_SIZE, len(ids)))
+        else:
+            ids = ids[:SUGGESTIONS_PAGE_SIZE]
+        return (
+            User.objects.filter(id__in=ids)
+            .select_related("avatar")
+            .order_by(
+                Case(*[When(id=user_id, then=rank) for rank, user_id in enumerate(ids)])
             )
-            .exclude(following_id__in=list(already_following_ids) + [user.id])
-            .order_by("?")[:20]
-            .values("following_id")
-        )
-        return User.objects.filter(id__in=friends_of_friends_ids).order_by(
-            "-date_joined"
         )